@@ -1,6 +1,6 @@
 import os
 import re
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -17,7 +17,7 @@ from mltoolbox.utils.docker import (
     find_available_port,
     start_container,
 )
-from mltoolbox.utils.helpers import remote_cmd
+from mltoolbox.utils.helpers import get_git_branch, remote_cmd
 from mltoolbox.utils.logger import get_logger
 from mltoolbox.utils.remote import (
     build_rclone_cmd,
@@ -35,6 +35,9 @@ from mltoolbox.utils.remote import (
 
 db = DB()
 
+# A Host or Match line in an ssh config; the keyword may be followed by "="
+_SSH_BLOCK_RE = re.compile(r"^\s*(host|match)(?:\s*=\s*|\s+)(.*)$", re.IGNORECASE)
+
 
 @click.group()
 def remote():
@@ -72,6 +75,11 @@ def remote():
 )
 @click.option("--skip-sync", is_flag=True, help="Skip syncing project files")
 @click.option("--yes", "-y", is_flag=True, help="Skip all confirmation prompts")
+@click.option(
+    "--force-setup",
+    is_flag=True,
+    help="Redo remote setup steps even if they ran recently with the same inputs",
+)
 @click.option(
     "--python-version",
     default=None,
@@ -120,6 +128,7 @@ def connect(
     exclude,
     skip_sync,
     yes,
+    force_setup,
     python_version,
     branch_name,
     network_mode,
@@ -128,7 +137,11 @@ def connect(
     identity_file,
     port,
 ):
-    """Connect to remote development environment."""
+    """Connect to remote development environment.
+
+    Set MLTOOLBOX_NO_PREVIEW=1 to print only the totals of the project sync
+    preview instead of the per-item tree.
+    """
     dryrun = ctx.obj.get("dryrun", False)
 
     # Validate Python version early if specified
@@ -176,16 +189,7 @@ def connect(
     container_name = env_vars.get("CONTAINER_NAME", project_name.lower())
 
     if not branch_name:
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            branch_name = result.stdout.strip()
-        except:  # noqa: E722
-            branch_name = None
+        branch_name = get_git_branch()
 
     # Get or create/update remote and project
     if not host:
@@ -242,36 +246,41 @@ def connect(
             f.write(include_line + content)
 
     # Read existing config and filter out previous entries for this host/alias
+    current_config = ssh_config_path.read_text() if ssh_config_path.exists() else ""
     existing_config = []
     skip_block = False
 
-    if ssh_config_path.exists():
-        with ssh_config_path.open("r") as f:
-            for line in f:
-                if line.startswith("Host "):
-                    current_host = line.split()[1].strip()
-                    # Skip this block if it matches our alias
-                    skip_block = current_host == remote.alias
-                if not skip_block:
-                    existing_config.append(line)
-
-    # Write updated config
-    with ssh_config_path.open("w") as f:
-        # Write existing entries (excluding the one we're updating)
-        f.writelines(existing_config)
-
-        # Add a newline if the file doesn't end with one
-        if existing_config and not existing_config[-1].endswith("\n"):
-            f.write("\n")
-
-        # Write the new/updated entry
-        f.write(f"Host {remote.alias}\n")
-        f.write(f"    HostName {remote.host}\n")
-        f.write(f"    User {remote.username}\n")
-        f.write("    ForwardAgent yes\n")
-        if remote.identity_file:
-            f.write(f"    IdentityFile {remote.identity_file}\n")
-        f.write("\n")
+    for line in current_config.splitlines(keepends=True):
+        match = _SSH_BLOCK_RE.match(line)
+        if match:
+            # Any Host or Match line ends the previous block; skip the new block
+            # if it is a Host block whose first pattern is our alias
+            patterns = match.group(2).split()
+            skip_block = (
+                match.group(1).lower() == "host"
+                and bool(patterns)
+                and patterns[0] == remote.alias
+            )
+        if not skip_block:
+            existing_config.append(line)
+
+    # Add a newline if the file doesn't end with one
+    if existing_config and not existing_config[-1].endswith("\n"):
+        existing_config.append("\n")
+
+    # Append the new/updated entry
+    existing_config.append(f"Host {remote.alias}\n")
+    existing_config.append(f"    HostName {remote.host}\n")
+    existing_config.append(f"    User {remote.username}\n")
+    existing_config.append("    ForwardAgent yes\n")
+    if remote.identity_file:
+        existing_config.append(f"    IdentityFile {remote.identity_file}\n")
+    existing_config.append("\n")
+
+    # Write updated config, leaving the file untouched if nothing changed
+    updated_config = "".join(existing_config)
+    if updated_config != current_config:
+        ssh_config_path.write_text(updated_config)
 
     from mltoolbox.utils.logger import get_logger
 
@@ -280,20 +289,23 @@ def connect(
     logger.console.print()  # Spacing
     logger.hint(f"Access your instance anytime with: [cyan]ssh {remote.alias}[/cyan]")
 
-    if not dryrun:
-        setup_zshrc(remote_config)
-        setup_rclone(remote_config)
-    else:
-        logger.info("[DRYRUN] Would setup zshrc and rclone (skipped)")
-
     logger.step(f"Creating remote project directories for {project_name}")
     if not dryrun:
-        remote_cmd(
-            remote_config,
-            [f"mkdir -p ~/projects/{project_name}"],
-            use_working_dir=False,
-        )
+        # .zshrc (with the project directory) and the rclone config are
+        # independent, so they go out together over the shared connection.
+        # Both finish before the Docker checks, which may prompt.
+        setup_futures = []
+        try:
+            with ThreadPoolExecutor(max_workers=2) as setup_pool:
+                setup_futures = [
+                    setup_pool.submit(setup_zshrc, remote_config, project_name),
+                    setup_pool.submit(setup_rclone, remote_config, force=force_setup),
+                ]
+        finally:
+            for future in setup_futures:
+                future.result()
     else:
+        logger.info("[DRYRUN] Would setup zshrc and rclone (skipped)")
         logger.info("[DRYRUN] Would create remote project directories (skipped)")
 
     # Check system requirements
@@ -309,16 +321,6 @@ def connect(
         logger.info("[DRYRUN] Would check NVIDIA Container Toolkit (skipped)")
         logger.success("[DRYRUN] NVIDIA Container Toolkit checked (simulated)")
 
-    # First ensure remote directory exists
-    if not dryrun:
-        remote_cmd(
-            remote_config,
-            [f"mkdir -p ~/projects/{project_name}"],
-            use_working_dir=False,
-        )
-    else:
-        logger.info("[DRYRUN] Would ensure remote directory exists (skipped)")
-
     # Simple sync - no worktree detection or special handling
     logger.console.print()  # Spacing before sync
     if not skip_sync:
@@ -574,8 +576,17 @@ def remove(host_or_alias: str):
 @click.option(
     "--port", "-P", default=None, type=int, help="SSH port to use (default 22)"
 )
-def sync(host_or_alias, exclude, port):
-    """Sync project files with remote host."""
+@click.option(
+    "--lan/--no-lan",
+    default=None,
+    help="Tune the transfer for a fast local link (default: detect from host address)",
+)
+def sync(host_or_alias, exclude, port, lan):
+    """Sync project files with remote host.
+
+    Set MLTOOLBOX_NO_PREVIEW=1 to print only the totals of the sync preview
+    instead of the per-item tree.
+    """
     project_name = Path.cwd().name
     remote = db.get_remote_fuzzy(host_or_alias)
     if (
@@ -588,7 +599,7 @@ def sync(host_or_alias, exclude, port):
         )
     remote_config = RemoteConfig(host=remote.host, username=remote.username, port=port)
 
-    sync_project(remote_config, project_name, exclude=exclude)
+    sync_project(remote_config, project_name, exclude=exclude, lan=lan)
 
     logger = get_logger()
     logger.console.print()  # Spacing
@@ -951,16 +962,7 @@ def attach(host_or_alias, port, container_name, branch_name):
 
     # Get current branch if not specified (same logic as connect command)
     if not branch_name:
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            branch_name = result.stdout.strip()
-        except:  # noqa: E722
-            branch_name = None
+        branch_name = get_git_branch()
 
     # Append branch name to container name (same logic as connect command)
     # But only if it's not already included in the container name
@@ -1,7 +1,9 @@
 from __future__ import annotations  # noqa: INP001
 
+import io
 import os
 import subprocess
+import tarfile
 import time
 from importlib.resources import files
 from pathlib import Path
@@ -9,9 +11,9 @@ from pathlib import Path
 import click
 
 from mltoolbox.utils.db import DB
-from mltoolbox.utils.remote import update_env_file
+from mltoolbox.utils.remote import ssh_command, update_env_file
 
-from .helpers import RemoteConfig, remote_cmd
+from .helpers import RemoteConfig, remote_cmd, remote_cmd_batch
 from .logger import get_logger
 
 
@@ -42,9 +44,6 @@ def ensure_ray_head_node(remote_config: RemoteConfig | None, python_version: str
     if "not_running" in result.stdout:
         logger.step("Starting Ray head node on remote host")
 
-        # Get paths for Ray head files
-        temp_files_to_cleanup = []
-
         # Use modern importlib.resources
         ray_head_compose_content = (
             files("mltoolbox") / "base" / "docker-compose-ray-head.yml"
@@ -53,105 +52,85 @@ def ensure_ray_head_node(remote_config: RemoteConfig | None, python_version: str
             files("mltoolbox") / "base" / "Dockerfile.ray-head"
         ).read_bytes()
 
-        # Create temporary files
-        import tempfile
-
-        ray_head_compose = Path(tempfile.mktemp(suffix=".yml"))
-        ray_head_dockerfile = Path(tempfile.mktemp(suffix=".dockerfile"))
-        temp_files_to_cleanup.extend([ray_head_compose, ray_head_dockerfile])
-
-        ray_head_compose.write_bytes(ray_head_compose_content)
-        ray_head_dockerfile.write_bytes(ray_head_dockerfile_content)
+        # Copy both files as one tar stream over a single ssh connection that also
+        # creates ~/ray, instead of a remote mkdir plus one scp per file
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            for name, content in (
+                ("docker-compose.yml", ray_head_compose_content),
+                ("Dockerfile.ray-head", ray_head_dockerfile_content),
+            ):
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                info.mode = 0o644
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(content))
+
+        upload = subprocess.run(
+            ssh_command(remote_config, "mkdir -p ~/ray && tar -C ~/ray -xf -"),
+            input=archive.getvalue(),
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+        if upload.returncode != 0:
+            logger.warning(
+                "Copying Ray head files failed: "
+                f"{upload.stderr.decode(errors='replace').strip()}"
+            )
+            raise click.ClickException(
+                "Could not copy Ray head files to the remote host"
+            )
 
+        # Start the Ray head node with docker compose, with explicit error handling
         try:
-            # Create directory for compose file
             remote_cmd(
                 remote_config,
-                ["mkdir -p ~/ray"],
-                use_working_dir=False,
-            )
-
-            # Copy files to remote
-            scp_cmd1 = ["scp"]
-            if remote_config.port:
-                scp_cmd1.extend(["-P", str(remote_config.port)])
-            scp_cmd1.extend(
-                [
-                    str(ray_head_compose),
-                    f"{remote_config.username}@{remote_config.host}:~/ray/docker-compose.yml",
-                ]
-            )
-            subprocess.run(scp_cmd1, check=False)
-
-            scp_cmd2 = ["scp"]
-            if remote_config.port:
-                scp_cmd2.extend(["-P", str(remote_config.port)])
-            scp_cmd2.extend(
                 [
-                    str(ray_head_dockerfile),
-                    f"{remote_config.username}@{remote_config.host}:~/ray/Dockerfile.ray-head",
-                ]
+                    f"cd ~/ray && PYTHON_VERSION={python_version} DOCKER_BUILDKIT=0 docker compose up -d"
+                ],  # Added DOCKER_BUILDKIT=0
+                use_working_dir=False,
             )
-            subprocess.run(scp_cmd2, check=False)
+        except Exception as e:
+            logger.warning(f"Initial Ray head node start failed: {e}")
+            logger.step("Cleaning Docker cache and retrying")
 
-            # Start the Ray head node with docker compose, with explicit error handling
+            # Clean Docker cache and retry with --no-cache
             try:
                 remote_cmd(
                     remote_config,
-                    [
-                        f"cd ~/ray && PYTHON_VERSION={python_version} DOCKER_BUILDKIT=0 docker compose up -d"
-                    ],  # Added DOCKER_BUILDKIT=0
+                    ["docker system prune -f"],
                     use_working_dir=False,
                 )
-            except Exception as e:
-                logger.warning(f"Initial Ray head node start failed: {e}")
-                logger.step("Cleaning Docker cache and retrying")
-
-                # Clean Docker cache and retry with --no-cache
-                try:
-                    remote_cmd(
-                        remote_config,
-                        ["docker system prune -f"],
-                        use_working_dir=False,
-                    )
-                    logger.success("Docker cache cleaned")
-                except Exception as cleanup_error:
-                    logger.warning(f"Cache cleanup failed: {cleanup_error}")
+                logger.success("Docker cache cleaned")
+            except Exception as cleanup_error:
+                logger.warning(f"Cache cleanup failed: {cleanup_error}")
 
-                logger.step("Retrying build without cache")
-                # Retry with --no-cache if first attempt fails
-                remote_cmd(
+            logger.step("Retrying build without cache")
+            # Retry with --no-cache if first attempt fails
+            remote_cmd(
+                remote_config,
+                [
+                    f"cd ~/ray && DOCKER_BUILDKIT=0 PYTHON_VERSION={python_version} docker compose build --no-cache && docker compose up -d"
+                ],
+                use_working_dir=False,
+            )
+
+        # Wait for Ray to be ready
+        with logger.spinner("Waiting for Ray head node to be ready"):
+            for _ in range(10):
+                time.sleep(2)
+                result = remote_cmd(
                     remote_config,
-                    [
-                        f"cd ~/ray && DOCKER_BUILDKIT=0 PYTHON_VERSION={python_version} docker compose build --no-cache && docker compose up -d"
-                    ],
+                    ["nc -z localhost 6379 2>/dev/null || echo 'not_running'"],
                     use_working_dir=False,
                 )
-
-            # Wait for Ray to be ready
-            with logger.spinner("Waiting for Ray head node to be ready"):
-                for _ in range(10):
-                    time.sleep(2)
-                    result = remote_cmd(
-                        remote_config,
-                        ["nc -z localhost 6379 2>/dev/null || echo 'not_running'"],
-                        use_working_dir=False,
-                    )
-                    if "not_running" not in result.stdout:
-                        logger.success("Ray head node is ready")
-                        break
-                else:
-                    logger.warning(
-                        "Ray head node not responding after timeout, continuing anyway"
-                    )
-        finally:
-            # Clean up temporary files
-            for temp_file in temp_files_to_cleanup:
-                try:
-                    if temp_file.exists():
-                        temp_file.unlink()
-                except Exception:
-                    pass  # Ignore cleanup errors
+                if "not_running" not in result.stdout:
+                    logger.success("Ray head node is ready")
+                    break
+            else:
+                logger.warning(
+                    "Ray head node not responding after timeout, continuing anyway"
+                )
 
 
 def check_nvidia_container_toolkit(
@@ -310,28 +289,45 @@ def check_docker_group(remote: RemoteConfig, force: bool = False) -> None:
     logger = get_logger()
 
     try:
+        # Read group membership, whether docker works without sudo and the daemon's
+        # cgroup driver in one round trip, one "name: value" line each
+        result = remote_cmd(
+            remote,
+            [
+                'echo "groups: $(groups)"; '
+                "if docker ps -q >/dev/null 2>&1; then echo 'docker: ok'; "
+                "else echo 'docker: failed'; fi; "
+                "if [ -f /etc/docker/daemon.json ] && "
+                'grep -q \'"native.cgroupdriver":"cgroupfs"\' /etc/docker/daemon.json; then '
+                "echo 'cgroup: configured'; else echo 'cgroup: needs_config'; fi",
+            ],
+        )
+        status = {}
+        for line in result.stdout.splitlines():
+            name, sep, value = line.partition(": ")
+            if sep:
+                status[name.strip()] = value.strip()
+
         # Check if user is in docker group
-        result = remote_cmd(remote, ["groups"])
-        needs_group_setup = "docker" not in result.stdout
+        needs_group_setup = "docker" not in status.get("groups", "").split()
 
         # Check if we can use docker without sudo
-        try:
-            remote_cmd(remote, ["docker ps -q"])
-            docker_working = True
-        except click.exceptions.ClickException:
-            docker_working = False
+        docker_working = status.get("docker") == "ok"
 
         if needs_group_setup or not docker_working:
             logger.step("Setting up Docker permissions")
 
-            # Add docker group if needed
-            remote_cmd(remote, ["sudo groupadd -f docker"])
-
-            # Add current user to docker group
-            remote_cmd(remote, ["sudo usermod -aG docker $USER"])
-
-            # Fix docker socket permissions
-            remote_cmd(remote, ["sudo chmod 666 /var/run/docker.sock"])
+            remote_cmd_batch(
+                remote,
+                [
+                    # Add docker group if needed
+                    "sudo groupadd -f docker",
+                    # Add current user to docker group
+                    "sudo usermod -aG docker $USER",
+                    # Fix docker socket permissions
+                    "sudo chmod 666 /var/run/docker.sock",
+                ],
+            )
 
             logger.success("Docker permissions set up successfully")
 
@@ -343,16 +339,7 @@ def check_docker_group(remote: RemoteConfig, force: bool = False) -> None:
                 logger.warning("Docker still requires sudo - continuing with sudo")
 
         # Check if docker daemon uses the right cgroup driver
-        result = remote_cmd(
-            remote,
-            [
-                "if [ -f /etc/docker/daemon.json ] && "
-                'grep -q \'"native.cgroupdriver":"cgroupfs"\' /etc/docker/daemon.json; then '
-                "echo 'configured'; else echo 'needs_config'; fi",
-            ],
-        )
-
-        if "needs_config" in result.stdout:
+        if status.get("cgroup") == "needs_config":
             # Check for running containers before modifying daemon config
             running_containers = (
                 remote_cmd(
@@ -57,7 +57,9 @@ class EnhancedDockerRunner:
                 "Step 7/7 : LABEL version=1.0",
                 f"Successfully built {''.join(random.choices('abcdef1234567890', k=12))}",
             ]
-            with self.logger.live_output(f"Docker Build: {tag} [DRY RUN]") as output:
+            with self.logger.live_output(
+                f"Docker Build: {tag} [DRY RUN]", docker=True
+            ) as output:
                 for step in steps:
                     output.write(step + "\n")
                     _time.sleep(0.2)
@@ -75,7 +77,9 @@ class EnhancedDockerRunner:
             if self.remote_config:
                 cmd_str = " ".join(cmd)
                 if live_output:
-                    with self.logger.live_output(f"Docker Build: {tag}") as output:
+                    with self.logger.live_output(
+                        f"Docker Build: {tag}", docker=True
+                    ) as output:
                         result = remote_cmd(
                             self.remote_config,
                             [cmd_str],
@@ -93,6 +97,7 @@ class EnhancedDockerRunner:
                         status="success" if result.returncode == 0 else "failed",
                         exit_code=result.returncode,
                         duration=duration,
+                        docker=True,
                     ) as panel:
                         panel.write(result.stdout)
                         if result.stderr:
@@ -100,9 +105,13 @@ class EnhancedDockerRunner:
                 success = result.returncode == 0
             else:
                 if live_output:
-                    result = run_with_live_output(cmd, f"Docker Build: {tag}")
+                    result = run_with_live_output(
+                        cmd, f"Docker Build: {tag}", docker=True
+                    )
                 else:
-                    result = run_with_panel_output(cmd, f"Docker Build: {tag}")
+                    result = run_with_panel_output(
+                        cmd, f"Docker Build: {tag}", docker=True
+                    )
                 success = result.returncode == 0
             duration = _time.time() - start_time
             if success:
@@ -244,7 +253,9 @@ class EnhancedDockerRunner:
             import time as _time
 
             services = ["web", "db", "worker"]
-            with self.logger.live_output("Docker Compose Up [DRY RUN]") as output:
+            with self.logger.live_output(
+                "Docker Compose Up [DRY RUN]", docker=True
+            ) as output:
                 for svc in services:
                     output.write(f"Creating service {svc}...\n")
                     _time.sleep(0.2)
@@ -276,14 +287,18 @@ class EnhancedDockerRunner:
                         " ".join([f"{k}={v}" for k, v in env_vars.items()]) + " "
                     )
                 cmd_str = env_prefix + " ".join(cmd)
-                with self.logger.live_output("Docker Compose Up") as output:
+                with self.logger.live_output(
+                    "Docker Compose Up", docker=True
+                ) as output:
                     result = remote_cmd(self.remote_config, [cmd_str])
                     output.write(result.stdout)
                     if result.stderr:
                         output.write(f"\nSTDERR:\n{result.stderr}")
                 success = result.returncode == 0
             else:
-                result = run_with_live_output(cmd, "Docker Compose Up", env=env)
+                result = run_with_live_output(
+                    cmd, "Docker Compose Up", env=env, docker=True
+                )
                 success = result.returncode == 0
             duration = _time.time() - start_time
             if success:
@@ -1,3 +1,5 @@
+import functools
+import logging
 import os
 import subprocess
 import time
@@ -164,6 +166,24 @@ def get_ssh_config(
     return host_config
 
 
+@functools.lru_cache(maxsize=1)
+def get_git_branch() -> str | None:
+    """Return the git branch checked out in the current directory, or None.
+
+    The CLI never switches branches, so git is only asked once per process.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
 def remote_cmd(
     config: RemoteConfig,
     command: list[str],
@@ -208,7 +228,7 @@ def remote_cmd(
         full_cmd = cmd_str
 
     # Only show command details in debug mode
-    if logger.logger.level <= 10:  # DEBUG level
+    if logger.is_enabled_for(logging.DEBUG):
         logger.debug(f"Executing remote command: {command}")
         logger.debug(f"Target host: {config.host}")
 
@@ -244,8 +264,6 @@ def remote_cmd(
                     actual_username,
                     **connect_kwargs,
                 )
-            _, stdout, _ = ssh.exec_command("pwd")
-            remote_cwd = stdout.read().decode().strip()
             # Execute command with PTY
             transport = ssh.get_transport()
             if transport is None:
@@ -283,7 +301,8 @@ def remote_cmd(
             if is_docker_command or is_verbose_command:
                 command_type = "Docker Command" if is_docker_command else "Command"
                 with logger.live_output(
-                    f"Remote {command_type} on {config.host}"
+                    f"Remote {command_type} on {config.host}",
+                    docker=is_docker_command,
                 ) as live_output:
                     while True:
                         data_received = False
@@ -348,8 +367,11 @@ def remote_cmd(
                     error_details.append(output_str)
 
             # Show context in debug mode only
-            if logger.logger.level <= 10:  # DEBUG level
-                error_details.insert(0, f"Host: {actual_hostname}, Dir: {remote_cwd}")
+            if logger.is_enabled_for(logging.DEBUG):
+                remote_dir = config.working_dir if use_working_dir else None
+                error_details.insert(
+                    0, f"Host: {actual_hostname}, Dir: {remote_dir or '~'}"
+                )
 
             with logger.command_output(
                 command=display_cmd,
@@ -409,3 +431,17 @@ def remote_cmd(
         ) as cmd_output:
             cmd_output.write(f"Unexpected error: {str(e)}")
         raise click.ClickException("Command execution failed")
+
+
+def remote_cmd_batch(
+    config: RemoteConfig,
+    commands: list[str],
+    use_working_dir=True,
+    dryrun: bool = False,
+) -> subprocess.CompletedProcess:
+    """Execute several commands on the remote host in a single round trip.
+
+    Commands run in order as one shell script and stop at the first failure.
+    """
+    script = "\n".join(["set -e", *commands])
+    return remote_cmd(config, [script], use_working_dir=use_working_dir, dryrun=dryrun)
@@ -2,86 +2,362 @@
 Sophisticated logging system for mltoolbox with colorlog and rich console output.
 """
 
+import functools
 import logging
 import re
+import string
 import sys
 import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime
+from itertools import groupby
 
 import colorlog
 from rich.console import Console
-from rich.live import Live
-from rich.panel import Panel
-from rich.progress import (
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-)
+from rich.text import Text
 
 # ANSI escape sequence pattern - more comprehensive
 ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
 # Additional control characters to strip
 CONTROL_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
+# Same set as CONTROL_CHARS as a str.translate deletion table
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]
+)
 # Cursor movement and other terminal control sequences
 CURSOR_CONTROL = re.compile(r"\x1B\[[0-9;]*[A-Za-z]")
+# Cursor movement, clear line/screen, home and show/hide cursor in one pass
+CURSOR_AND_CLEAR = re.compile(r"\x1b\[(?:[0-9]*[ABCDJK]|2J|H|\?25[hl])")
+# Cursor movement/clear left inside a line, including bare "[1A"-style remnants
+INLINE_CURSOR = re.compile(r"\x1b\[[0-9]*[ABCDJK]|\[\d+[AG]")
+# Docker-specific noise lines, fused into one anchored alternation so each line
+# costs a single match instead of one per pattern
+DOCKER_NOISE_LINE = re.compile(
+    r"^\s*(?:"
+    r"\d+\.\d+s"  # Timing indicators
+    r"|\[\d+/\d+\]"  # Progress indicators
+    r"|#\d+"  # Step numbers
+    r"|\.\.\."  # Ellipsis
+    r"|\r"  # Carriage returns
+    r"|\x1b\[[0-9;]*[mK]"  # Remaining escape sequences
+    r"|\[?\+\]?\s*Building\s+\d+\.\d+s.*"  # Docker build progress
+    r"|=>.*"  # Docker build steps
+    r"|\[1A\[.*"  # Cursor movement artifacts
+    r"|\[0G.*"  # Cursor positioning artifacts
+    r"|\[\?25[hl].*"  # Cursor visibility artifacts
+    r")\s*$"
+)
+
+# Name of the colorlog handler attached to the "mltoolbox" logger
+_HANDLER_NAME = "mltoolbox-colorlog"
+
+# Tree-style prefixes for nested output lines
+_TREE_BRANCH = "      ├─ "
+_TREE_LAST = "      └─ "
+_TREE_PIPE = "      │  "
+_MORE_LINES = _TREE_LAST + "[dim]... ({} more lines)[/dim]"
+# For counts that include lines estimated without full cleaning
+_MORE_LINES_APPROX = _TREE_LAST + "[dim]... (~{} more lines)[/dim]"
+
+# Static markup for section headers, built once instead of per call
+_SECTION_INDICATOR = "[bold blue]●[/bold blue]"
+_DRY_RUN_PREFIX = "[DRY RUN] "
+
+# Characters that make up punctuation-only noise lines (brackets, arrows, rules)
+_NOISE_PUNCTUATION = "[]()-+=><|." + string.whitespace
+
+# Lowercase substrings that mark a line as Docker build noise
+_DOCKER_NOISE_SUBSTRINGS = (
+    "sending build context",
+    "step 1/",
+    "step 2/",
+    "step 3/",
+    "step 4/",
+    "step 5/",
+    "step 6/",
+    "step 7/",
+    "step 8/",
+    "step 9/",
+    "step 10/",
+    "---> using cache",
+    "---> running in",
+    "removing intermediate container",
+    "successfully built",
+    "successfully tagged",
+    "[+] building",
+    "=> load build definition",
+    "=> load .dockerignore",
+    "=> load metadata",
+    "=> transferring context",
+    "=> transferring dockerfile",
+    "=> cached",
+    "docker:default",
+    "=> =>",
+)
+# Docker noise substrings (case-insensitive, anywhere in the line) plus lines that
+# are only a timing ("1.2s"), progress ("[3/10]") or step-number ("#12") marker,
+# so each line is checked with a single search
+_NOISE_RE = re.compile(
+    "(?i:"
+    + "|".join(map(re.escape, _DOCKER_NOISE_SUBSTRINGS))
+    + r")|^\s*(?:\d+\.\d+s|\[\d+/\d+\]|#\d+)\s*$"
+)
+
+
+# Compact captures show 5 lines; keep some slack for consecutive-duplicate removal
+_CAPTURE_LINE_LIMIT = 64
+# Raw lines cleaned per batch while a compact capture is below its limit
+_CAPTURE_BATCH_LINES = 256
+# Live displays only keep the last 30 lines, so huge bursts are cleaned from the tail
+_LIVE_TAIL_CHARS = 64 * 1024
+
+# Last formatted timestamp as [epoch second, "HH:MM:SS"]
+_TS_CACHE = [0, ""]
 
 
-def clean_terminal_output(text: str) -> str:
-    """Clean terminal output by removing ANSI escape sequences and control characters."""
-    # Remove ANSI escape sequences
-    text = ANSI_ESCAPE.sub("", text)
-    # Remove cursor control sequences
-    text = CURSOR_CONTROL.sub("", text)
+def _now_hms() -> str:
+    """Return the current local time as HH:MM:SS, formatted at most once per second."""
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[:] = [t, time.strftime("%H:%M:%S", time.localtime(t))]
+    return _TS_CACHE[1]
+
+
+def clean_terminal_output(text: str, docker: bool = False) -> str:
+    """Clean terminal output by removing ANSI escape sequences and control characters.
+
+    Docker build noise (progress lines, step numbers, cursor artifacts) is only
+    filtered when ``docker`` is set, since other commands never produce it.
+    """
+    # Plain output carries no escape sequences; a substring check skips the passes
+    if "\x1b" in text:
+        # Remove ANSI escape sequences
+        text = ANSI_ESCAPE.sub("", text)
+        # Remove cursor control sequences
+        text = CURSOR_CONTROL.sub("", text)
+        # Remove cursor positioning sequences more aggressively
+        text = CURSOR_AND_CLEAR.sub("", text)
     # Remove other control characters
-    text = CONTROL_CHARS.sub("", text)
-
-    # Remove cursor positioning sequences more aggressively
-    text = re.sub(r"\x1b\[[0-9]*[ABCD]", "", text)  # Cursor movement
-    text = re.sub(r"\x1b\[[0-9]*[JK]", "", text)  # Clear sequences
-    text = re.sub(r"\x1b\[2J", "", text)  # Clear screen
-    text = re.sub(r"\x1b\[H", "", text)  # Home cursor
-    text = re.sub(r"\x1b\[\?25[hl]", "", text)  # Show/hide cursor
-
-    # Docker-specific cleaning - more aggressive patterns
-    docker_noise_patterns = [
-        r"^\s*\d+\.\d+s\s*$",  # Timing indicators
-        r"^\s*\[\d+/\d+\]\s*$",  # Progress indicators
-        r"^\s*#\d+\s*$",  # Step numbers
-        r"^\s*\.\.\.\s*$",  # Ellipsis
-        r"^\s*\r\s*$",  # Carriage returns
-        r"^\s*\x1b\[[0-9;]*[mK]\s*$",  # Remaining escape sequences
-        r"^\s*\[?\+\]?\s*Building\s+\d+\.\d+s.*$",  # Docker build progress
-        r"^\s*=>\s*.*$",  # Docker build steps
-        r"^\s*\[1A\[.*$",  # Cursor movement artifacts
-        r"^\s*\[0G.*$",  # Cursor positioning artifacts
-        r"^\s*\[\?25[hl].*$",  # Cursor visibility artifacts
-    ]
-
-    lines = text.split("\n")
-    cleaned_lines = []
-
-    for line in lines:
-        # Skip lines that match Docker noise patterns
-        if any(re.match(pattern, line) for pattern in docker_noise_patterns):
+    text = text.translate(_CONTROL_CHARS_TABLE)
+
+    def iter_meaningful_lines():
+        for line in text.split("\n"):
+            # Skip lines that match Docker noise patterns
+            if docker and DOCKER_NOISE_LINE.match(line):
+                continue
+
+            # Remove inline cursor control sequences (all of them contain "[")
+            if "[" in line:
+                line = INLINE_CURSOR.sub("", line)
+
+            # Clean up the line
+            line = line.rstrip()
+            if line and len(line.strip()) > 2:  # Only keep meaningful lines
+                yield line
+
+    # Blank lines are never kept, so a single join is all that's needed
+    return "\n".join(iter_meaningful_lines())
+
+
+def _dim_line(prefix: str, line: str) -> Text:
+    """Build a dimmed tree line as styled Text, skipping rich's markup parser.
+
+    Captured output is shown verbatim, so brackets in it are never read as markup.
+    """
+    return Text.assemble(prefix, (line, "dim"))
+
+
+def _dedup_nonempty(lines: list[str]) -> list[str]:
+    """Drop blank lines and collapse runs of consecutive duplicates."""
+    return [line for line, _ in groupby(line for line in lines if line.strip())]
+
+
+def _capture_lines(
+    content_lines: list[str], text: str, docker: bool, raw: bool = False
+) -> int:
+    """Clean ``text`` into ``content_lines`` until the capture limit is reached.
+
+    Only the first few lines are ever displayed, so once enough are stored the
+    rest are counted instead of cleaned. The count leaves out noise and repeated
+    lines using the cached ``_is_noise_line`` check rather than the full
+    cleaning rules, so it is only an estimate and is shown as one. With ``raw``
+    the text is known to be free of terminal control sequences and is only split
+    into lines. Returns the number of skipped lines.
+    """
+    skipped = 0
+    raw_lines = text.split("\n")
+    for start in range(0, len(raw_lines), _CAPTURE_BATCH_LINES):
+        batch = raw_lines[start : start + _CAPTURE_BATCH_LINES]
+        if len(content_lines) >= _CAPTURE_LINE_LIMIT:
+            if not raw:
+                batch = [
+                    ANSI_ESCAPE.sub("", line) if "\x1b" in line else line
+                    for line in batch
+                ]
+            skipped += sum(
+                1
+                for line, _ in groupby(line.strip() for line in batch)
+                if not _is_noise_line(line)
+            )
             continue
+        clean_text = "\n".join(batch)
+        if not raw:
+            clean_text = clean_terminal_output(clean_text, docker=docker)
+        content_lines.extend(
+            line.rstrip() for line in clean_text.split("\n") if line.strip()
+        )
+    return skipped
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_noise_line(line: str) -> bool:
+    """Determine if a line is noise that should be filtered out.
+
+    Build output repeats the same lines constantly, so verdicts are cached per line.
+    """
+    stripped = line.strip()
+
+    # Skip empty lines
+    if not stripped:
+        return True
 
-        # Remove inline cursor control sequences
-        line = re.sub(r"\x1b\[[0-9]*[ABCD]", "", line)
-        line = re.sub(r"\x1b\[[0-9]*[JK]", "", line)
-        line = re.sub(r"\[\d+[AG]", "", line)
+    # Skip Docker build progress and lone timing/progress/step-number lines
+    if _NOISE_RE.search(line):
+        return True
 
-        # Clean up the line
-        line = line.rstrip()
-        if line and len(line.strip()) > 2:  # Only keep meaningful lines
-            cleaned_lines.append(line)
+    # Skip lines with ONLY special characters or whitespace (but allow lines with content + special chars)
+    if len(stripped) < 5 and not stripped.strip(_NOISE_PUNCTUATION):
+        return True
 
-    # Join lines and remove excessive whitespace
-    text = "\n".join(cleaned_lines)
-    # Remove excessive newlines but preserve structure
-    text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
+    # Most lines should be shown - only filter obvious noise
+    return False
 
-    return text
+
+class _CommandCapture:
+    """File-like sink collecting cleaned lines for compact tree output."""
+
+    __slots__ = ("lines", "skipped", "_docker", "_raw")
+
+    def __init__(self, docker: bool = False, raw: bool = False):
+        self.lines = []
+        self.skipped = 0
+        self._docker = docker
+        self._raw = raw
+
+    def write(self, text):
+        if text.strip():
+            self.skipped += _capture_lines(self.lines, text, self._docker, self._raw)
+
+    def flush(self):
+        pass
+
+
+class _PanelCapture:
+    """File-like sink collecting every cleaned line for panel output."""
+
+    __slots__ = ("lines", "_docker", "_raw")
+
+    def __init__(self, docker: bool = False, raw: bool = False):
+        self.lines = []
+        self._docker = docker
+        self._raw = raw
+
+    def write(self, text):
+        if text.strip():
+            clean_text = (
+                text if self._raw else clean_terminal_output(text, docker=self._docker)
+            )
+            if clean_text.strip():
+                self.lines.extend(
+                    line.rstrip() for line in clean_text.split("\n") if line.strip()
+                )
+
+    def flush(self):
+        pass
+
+
+class _LiveCapture:
+    """File-like sink feeding the most recent output lines to a rich Live display."""
+
+    __slots__ = (
+        "lines",
+        "_live",
+        "_title",
+        "_docker",
+        "_raw",
+        "_raw_buffer",
+        "_last_update",
+    )
+
+    def __init__(self, live, title: str, docker: bool = False, raw: bool = False):
+        self.lines = []
+        self._live = live
+        self._title = title
+        self._docker = docker
+        self._raw = raw
+        self._raw_buffer = []
+        self._last_update = 0
+
+    def drain(self):
+        """Clean and filter everything received since the last refresh in one pass."""
+        if not self._raw_buffer:
+            return
+        raw_text = "".join(self._raw_buffer)
+        self._raw_buffer.clear()
+        if len(raw_text) > _LIVE_TAIL_CHARS:
+            # Start at a line boundary inside the retained tail
+            tail_start = raw_text.find("\n", -_LIVE_TAIL_CHARS) + 1
+            raw_text = raw_text[tail_start:]
+        clean_content = (
+            raw_text
+            if self._raw
+            else clean_terminal_output(raw_text, docker=self._docker)
+        )
+        content_buffer = self.lines
+        for line in clean_content.split("\n"):
+            line = line.strip()
+            # Only filter obvious noise, keep most content
+            if line and not _is_noise_line(line):
+                content_buffer.append(line)
+        if len(content_buffer) > 30:
+            del content_buffer[:-30]
+
+    def write(self, content):
+        if not content.strip():
+            return
+        # Buffer raw text; only pay for cleanup when the display refreshes
+        self._raw_buffer.append(content)
+        current_time = time.time()
+        if current_time - self._last_update <= 0.2:
+            return
+        self.drain()
+        now = _now_hms()
+        title = self._title
+        # Show last few lines in compact format; captured lines go in as plain
+        # Text so brackets in command output are never parsed as markup
+        header = Text.assemble(f"{now}  ", ("⟳", "blue"), "  ", (title, "dim"))
+        recent_lines = self.lines[-3:]
+        if recent_lines:
+            display = Text("\n").join(
+                [
+                    header,
+                    *(
+                        _dim_line(
+                            _TREE_PIPE, line if len(line) <= 80 else f"{line[:77]}..."
+                        )
+                        for line in recent_lines
+                    ),
+                ]
+            )
+            self._live.update(display)
+        else:
+            header.append("  ")
+            header.append("Processing...", style="dim")
+            self._live.update(header)
+        self._last_update = current_time
+
+    def flush(self):
+        pass
 
 
 class MLToolboxLogger:
@@ -94,31 +370,29 @@ class MLToolboxLogger:
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
+                    # Fully initialize before publishing so other threads never
+                    # see a half-built instance
+                    instance = super().__new__(cls)
+                    instance.console = Console(stderr=True)
+                    instance.logger = instance._setup_logger()
+                    # Lock to prevent concurrent Live displays
+                    instance._live_lock = threading.Lock()
+                    instance.dryrun = False
+                    cls._instance = instance
         return cls._instance
 
-    def __init__(self):
-        if self._initialized:
-            return
-
-        self.console = Console(stderr=True)
-        self.logger = self._setup_logger()
-        self._live_lock = threading.Lock()  # Lock to prevent concurrent Live displays
-        self._initialized = True
-        self.dryrun = False
-
     def _setup_logger(self) -> logging.Logger:
         """Set up colorlog logger with rich formatting."""
         logger = logging.getLogger("mltoolbox")
         logger.setLevel(logging.INFO)
 
-        # Remove existing handlers
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
+        # Handler is installed once per process; skip if it's already attached
+        if any(h.get_name() == _HANDLER_NAME for h in logger.handlers):
+            return logger
 
         # Create colorlog handler
         handler = colorlog.StreamHandler(sys.stderr)
+        handler.set_name(_HANDLER_NAME)
         handler.setFormatter(
             colorlog.ColoredFormatter(
                 "%(log_color)s%(levelname)-8s%(reset)s %(blue)s%(name)s%(reset)s %(message)s",
@@ -141,92 +415,107 @@ class MLToolboxLogger:
 
         return logger
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Check whether messages at ``level`` would be emitted.
+
+        Lets callers skip building expensive debug messages when debug is off.
+        """
+        return self.logger.isEnabledFor(level)
+
     def set_dryrun(self, dryrun: bool = True):
         self.dryrun = dryrun
 
     def info(self, message: str, **kwargs):
         """Log info message."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if self.dryrun:
             message = f"[DRY RUN] {message}"
         self.logger.info(message, **kwargs)
 
     def hint(self, message: str):
         """Display a helpful hint or tip."""
-        now = datetime.now().strftime("%H:%M:%S")
+        now = _now_hms()
         self.console.print(f"{now}  [yellow]💡[/yellow]  [dim]{message}[/dim]")
 
     def summary(self, title: str, items: list[str]):
         """Display a completion summary with items."""
-        now = datetime.now().strftime("%H:%M:%S")
+        now = _now_hms()
         self.console.print()  # Blank line for spacing
         self.console.print(f"{now}  [bold green]✓[/bold green]  [bold]{title}[/bold]")
         for idx, item in enumerate(items):
-            prefix = "      └─ " if idx == len(items) - 1 else "      ├─ "
+            prefix = _TREE_LAST if idx == len(items) - 1 else _TREE_BRANCH
             self.console.print(f"{prefix}[dim]{item}[/dim]")
         self.console.print()  # Blank line after summary
 
     def empty_state(self, message: str, suggestion: str | None = None):
         """Display an empty state message."""
-        now = datetime.now().strftime("%H:%M:%S")
+        now = _now_hms()
         self.console.print(f"{now}  [grey37]○[/grey37]  [dim]{message}[/dim]")
         if suggestion:
-            self.console.print(f"      └─ [dim italic]{suggestion}[/dim italic]")
+            self.console.print(f"{_TREE_LAST}[dim italic]{suggestion}[/dim italic]")
 
     def warning(self, message: str, **kwargs):
         """Log warning message."""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         if self.dryrun:
             message = f"[DRY RUN] {message}"
         self.logger.warning(message, **kwargs)
 
     def error(self, message: str, **kwargs):
         """Log error message."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         if self.dryrun:
             message = f"[DRY RUN] {message}"
         self.logger.error(message, **kwargs)
 
     def debug(self, message: str, **kwargs):
         """Log debug message."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if self.dryrun:
             message = f"[DRY RUN] {message}"
         self.logger.debug(message, **kwargs)
 
     def success(self, message: str):
         """Log success message with subtle indicator."""
-        now = datetime.now().strftime("%H:%M:%S")
+        now = _now_hms()
         if self.dryrun:
             message = f"[DRY RUN] {message}"
         self.console.print(f"{now}  [green]✓[/green]  [dim]{message}[/dim]")
 
     def failure(self, message: str):
         """Log failure message with subtle indicator."""
-        now = datetime.now().strftime("%H:%M:%S")
+        now = _now_hms()
         if self.dryrun:
             message = f"[DRY RUN] {message}"
         self.console.print(f"{now}  [red]✗[/red]  [dim]{message}[/dim]")
 
     def step(self, message: str):
         """Log a step in the process with subtle indicator."""
-        now = datetime.now().strftime("%H:%M:%S")
+        now = _now_hms()
         if self.dryrun:
             message = f"[DRY RUN] {message}"
         self.console.print(f"{now}  [blue]→[/blue]  [dim]{message}[/dim]")
 
     def section(self, title: str):
         """Print a compact section header."""
-        now = datetime.now().strftime("%H:%M:%S")
-        prefix = "[DRY RUN] " if self.dryrun else ""
-        self.console.print(
-            f"{now}  [bold blue]●[/bold blue]  [bold]{prefix}{title}[/bold]"
-        )
+        now = _now_hms()
+        prefix = _DRY_RUN_PREFIX if self.dryrun else ""
+        self.console.print(f"{now}  {_SECTION_INDICATOR}  [bold]{prefix}{title}[/bold]")
 
     @contextmanager
     def spinner(self, message: str):
         """Context manager for spinner during long operations."""
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         # Try to acquire the live lock, but don't block
         if self._live_lock.acquire(blocking=False):
             try:
                 # Use compact spinner
-                now = datetime.now().strftime("%H:%M:%S")
+                now = _now_hms()
                 if self.dryrun:
                     message = f"[DRY RUN] {message}"
                 with Progress(
@@ -254,37 +543,25 @@ class MLToolboxLogger:
         status: str = None,
         exit_code: int = None,
         duration: float = None,
+        docker: bool = False,
+        raw: bool = False,
     ):
-        """Context manager for compact command output with tree-style formatting."""
-        import time as _time
+        """Context manager for compact command output with tree-style formatting.
 
-        _time.time()
-        content_lines = []
+        Pass ``raw=True`` when the output comes from a pipe without a TTY (no ANSI
+        sequences) to skip terminal cleanup.
+        """
         cmd_status = status
         cmd_exit_code = exit_code
         cmd_duration = duration
         dryrun = self.dryrun
 
-        class CommandCapture:
-            def write(self, text):
-                if text.strip():
-                    clean_text = clean_terminal_output(text)
-                    if clean_text.strip():
-                        lines = [
-                            line.rstrip()
-                            for line in clean_text.split("\n")
-                            if line.strip()
-                        ]
-                        content_lines.extend(lines)
-
-            def flush(self):
-                pass
-
-        capture = CommandCapture()
+        capture = _CommandCapture(docker, raw)
+        content_lines = capture.lines
         try:
             yield capture
         finally:
-            _time.time()
+            skipped_lines = capture.skipped
             # Determine status indicator
             if cmd_status == "success":
                 indicator = "[green]●[/green]"
@@ -294,7 +571,7 @@ class MLToolboxLogger:
                 indicator = "[grey37]●[/grey37]"
 
             # Compose timestamp and indicator
-            now = datetime.now().strftime("%H:%M:%S")
+            now = _now_hms()
             timestamp_indicator = f"{now}  {indicator}"
 
             # Truncate command if too long
@@ -312,77 +589,85 @@ class MLToolboxLogger:
             if cmd_duration is not None:
                 metadata_parts.append(f"Duration: {cmd_duration:.2f}s")
             metadata = "  ".join(metadata_parts)
+            self._print_tree(
+                f"{timestamp_indicator}  [dim]{display_cmd}[/dim]",
+                metadata,
+                content_lines,
+                skipped_lines,
+            )
 
-            # Print main line with command
-            self.console.print(f"{timestamp_indicator}  [dim]{display_cmd}[/dim]")
-
-            # Determine if we have both metadata and output
-            has_output = bool(content_lines)
-            has_metadata = bool(metadata)
-
-            # Print metadata and output with tree-style indentation
-            if has_metadata or has_output:
-                filtered_lines = []
-                if content_lines:
-                    prev_line = None
-                    for line in content_lines:
-                        if line != prev_line and line.strip():
-                            filtered_lines.append(line)
-                            prev_line = line
-
-                # Determine tree characters based on what follows
-                if has_metadata and has_output:
-                    # Metadata is not last, use ├─
-                    metadata_prefix = "      ├─ "
-                    # Output lines use │  except the last one
-                    output_prefix = "      │  "
-                    last_output_prefix = "      └─ "
-                elif has_metadata:
-                    # Only metadata, use └─
-                    metadata_prefix = "      └─ "
-                    output_prefix = None
-                    last_output_prefix = None
-                else:
-                    # Only output
-                    metadata_prefix = None
-                    output_prefix = "      │  "
-                    last_output_prefix = "      └─ "
-
-                # Print metadata
-                if has_metadata and metadata_prefix:
-                    self.console.print(f"{metadata_prefix}[dim]{metadata}[/dim]")
-
-                # Print output content with tree indentation
-                if filtered_lines:
-                    # Limit output to first few lines for compactness
-                    max_output_lines = 5
-                    output_lines = filtered_lines[:max_output_lines]
-                    total_lines = len(output_lines)
-
-                    for idx, line in enumerate(output_lines):
-                        # Truncate very long lines
-                        if len(line) > 80:
-                            line = line[:77] + "..."
-
-                        # Use appropriate prefix based on position
-                        if idx == total_lines - 1:
-                            # Last line uses └─
-                            prefix = (
-                                last_output_prefix
-                                if last_output_prefix
-                                else "      └─ "
-                            )
-                        else:
-                            # Middle lines use │
-                            prefix = output_prefix if output_prefix else "      │  "
+    def _print_tree(
+        self,
+        header: str,
+        metadata: str,
+        content_lines: list[str],
+        skipped_lines: int = 0,
+    ):
+        """Print a header line with metadata and output as a compact tree."""
+        # Collect the main line, metadata and output so they go out in one write
+        out = [header]
+
+        # Determine if we have both metadata and output
+        has_output = bool(content_lines)
+        has_metadata = bool(metadata)
+
+        # Print metadata and output with tree-style indentation
+        if has_metadata or has_output:
+            filtered_lines = _dedup_nonempty(content_lines)
+
+            # Determine tree characters based on what follows
+            if has_metadata and has_output:
+                # Metadata is not last, use ├─
+                metadata_prefix = _TREE_BRANCH
+                # Output lines use │  except the last one
+                output_prefix = _TREE_PIPE
+                last_output_prefix = _TREE_LAST
+            elif has_metadata:
+                # Only metadata, use └─
+                metadata_prefix = _TREE_LAST
+                output_prefix = None
+                last_output_prefix = None
+            else:
+                # Only output
+                metadata_prefix = None
+                output_prefix = _TREE_PIPE
+                last_output_prefix = _TREE_LAST
+
+            # Print metadata
+            if has_metadata and metadata_prefix:
+                out.append(f"{metadata_prefix}[dim]{metadata}[/dim]")
+
+            # Print output content with tree indentation
+            if filtered_lines:
+                # Limit output to first few lines for compactness
+                max_output_lines = 5
+                output_lines = filtered_lines[:max_output_lines]
+                total_lines = len(output_lines)
+
+                for idx, line in enumerate(output_lines):
+                    # Truncate very long lines
+                    if len(line) > 80:
+                        line = line[:77] + "..."
+
+                    # Use appropriate prefix based on position
+                    if idx == total_lines - 1:
+                        # Last line uses └─
+                        prefix = (
+                            last_output_prefix if last_output_prefix else _TREE_LAST
+                        )
+                    else:
+                        # Middle lines use │
+                        prefix = output_prefix if output_prefix else _TREE_PIPE
 
-                        self.console.print(f"{prefix}[dim]{line}[/dim]")
+                    out.append(_dim_line(prefix, line))
 
-                    if len(filtered_lines) > max_output_lines:
-                        remaining = len(filtered_lines) - max_output_lines
-                        self.console.print(
-                            f"      └─ [dim]... ({remaining} more lines)[/dim]"
-                        )
+                remaining = (
+                    max(len(filtered_lines) - max_output_lines, 0) + skipped_lines
+                )
+                if remaining:
+                    more_lines = _MORE_LINES_APPROX if skipped_lines else _MORE_LINES
+                    out.append(more_lines.format(remaining))
+        self.console.print(*out, sep="\n")
 
     @contextmanager
     def panel_output(
@@ -392,47 +677,27 @@ class MLToolboxLogger:
         status: str = None,
         exit_code: int = None,
         duration: float = None,
+        docker: bool = False,
+        raw: bool = False,
     ):
         """Context manager for bordered output panel with summary and clean look."""
-        import time as _time
+        from rich.panel import Panel
 
-        _time.time()
-        content_lines = []
         panel_status = status
         panel_exit_code = exit_code
         panel_duration = duration
         dryrun = self.dryrun
 
-        class PanelCapture:
-            def write(self, text):
-                if text.strip():
-                    clean_text = clean_terminal_output(text)
-                    if clean_text.strip():
-                        lines = [
-                            line.rstrip()
-                            for line in clean_text.split("\n")
-                            if line.strip()
-                        ]
-                        content_lines.extend(lines)
-
-            def flush(self):
-                pass
-
-        capture = PanelCapture()
+        capture = _PanelCapture(docker, raw)
+        content_lines = capture.lines
         try:
             yield capture
         finally:
-            _time.time()
             if content_lines:
-                filtered_lines = []
-                prev_line = None
-                for line in content_lines:
-                    if line != prev_line and line.strip():
-                        filtered_lines.append(line)
-                        prev_line = line
+                filtered_lines = _dedup_nonempty(content_lines)
                 content = "\n".join(filtered_lines)
                 # Compose summary line
-                now = datetime.now().strftime("%H:%M:%S")
+                now = _now_hms()
                 summary = f"{now}  "
                 if dryrun:
                     summary += "[DRY RUN] "
@@ -458,71 +723,29 @@ class MLToolboxLogger:
                 self.console.print(panel)
 
     @contextmanager
-    def live_output(self, title: str):
+    def live_output(self, title: str, docker: bool = False, raw: bool = False):
         """Context manager for live updating output with pro CLI look."""
-        import time as _time
+        from rich.live import Live
 
         if self._live_lock.acquire(blocking=False):
             try:
                 content_buffer = []
-                last_update_time = 0
-                _time.time()
-                # Use compact format for live updates
-                initial_display = f"{datetime.now().strftime('%H:%M:%S')}  [blue]⟳[/blue]  [dim]{title}[/dim]"
+                # Use compact format for live updates; parse markup once per update
+                # so Live's auto-refresh re-renders a Text instead of re-parsing a string
+                initial_display = Text.from_markup(
+                    f"{_now_hms()}  [blue]⟳[/blue]  [dim]{title}[/dim]"
+                )
                 with Live(
                     initial_display,
                     console=self.console,
                     refresh_per_second=5,
                     transient=True,
                 ) as live:
-
-                    class LiveCapture:
-                        def write(self, content):
-                            nonlocal last_update_time
-                            current_time = _time.time()
-                            if content.strip():
-                                clean_content = clean_terminal_output(content)
-                                if clean_content.strip():
-                                    lines = clean_content.split("\n")
-                                    for line in lines:
-                                        line = line.strip()
-                                        # Be less aggressive with filtering - show meaningful lines
-                                        if line and len(line.strip()) > 0:
-                                            # Only filter obvious noise, keep most content
-                                            if not self._is_noise_line(line):
-                                                content_buffer.append(line)
-                                    if len(content_buffer) > 30:
-                                        content_buffer = content_buffer[-30:]
-                                    if current_time - last_update_time > 0.2:
-                                        now = datetime.now().strftime("%H:%M:%S")
-                                        # Show last few lines in compact format
-                                        recent_lines = (
-                                            content_buffer[-3:]
-                                            if len(content_buffer) > 3
-                                            else content_buffer
-                                        )
-                                        if recent_lines:
-                                            display_lines = "\n".join(
-                                                [
-                                                    f"      │  [dim]{line[:80]}[/dim]"
-                                                    if len(line) <= 80
-                                                    else f"      │  [dim]{line[:77]}...[/dim]"
-                                                    for line in recent_lines
-                                                ]
-                                            )
-                                            live.update(
-                                                f"{now}  [blue]⟳[/blue]  [dim]{title}[/dim]\n{display_lines}"
-                                            )
-                                        else:
-                                            live.update(
-                                                f"{now}  [blue]⟳[/blue]  [dim]{title}[/dim]  [dim]Processing...[/dim]"
-                                            )
-                                        last_update_time = current_time
-
-                        def flush(self):
-                            pass
-
-                    yield LiveCapture()
+                    capture = _LiveCapture(live, title, docker, raw)
+                    content_buffer = capture.lines
+                    yield capture
+                    # Process any output that arrived after the last refresh
+                    capture.drain()
                     # Live display will auto-close when context exits
                 # After Live context exits, show compact final output
                 if content_buffer:
@@ -537,17 +760,12 @@ class MLToolboxLogger:
                         cmd_name = title
 
                     # Filter and clean content
-                    filtered_lines = []
-                    prev_line = None
-                    for line in content_buffer:
-                        if line != prev_line and line.strip():
-                            filtered_lines.append(line)
-                            prev_line = line
+                    filtered_lines = _dedup_nonempty(content_buffer)
 
                     # Use compact tree-style output
-                    now = datetime.now().strftime("%H:%M:%S")
+                    now = _now_hms()
                     indicator = "[green]●[/green]"
-                    self.console.print(f"{now}  {indicator}  [dim]{cmd_name}[/dim]")
+                    out = [f"{now}  {indicator}  [dim]{cmd_name}[/dim]"]
 
                     if filtered_lines:
                         max_output_lines = 5
@@ -561,59 +779,39 @@ class MLToolboxLogger:
 
                             # Use tree characters
                             if idx == total_lines - 1:
-                                prefix = "      └─ "
+                                prefix = _TREE_LAST
                             else:
-                                prefix = "      │  "
+                                prefix = _TREE_PIPE
 
-                            self.console.print(f"{prefix}[dim]{line}[/dim]")
+                            out.append(_dim_line(prefix, line))
 
                         if len(filtered_lines) > max_output_lines:
                             remaining = len(filtered_lines) - max_output_lines
-                            self.console.print(
-                                f"      └─ [dim]... ({remaining} more lines)[/dim]"
-                            )
+                            out.append(_MORE_LINES.format(remaining))
+                    self.console.print(*out, sep="\n")
             finally:
                 self._live_lock.release()
         else:
             # Fallback: use compact command_output format if live display unavailable
-            content_lines = []
-
-            class FallbackCapture:
-                def write(self, text):
-                    if text.strip():
-                        clean_text = clean_terminal_output(text)
-                        if clean_text.strip():
-                            lines = [
-                                line.rstrip()
-                                for line in clean_text.split("\n")
-                                if line.strip()
-                            ]
-                            content_lines.extend(lines)
-
-                def flush(self):
-                    pass
-
+            capture = _CommandCapture(docker, raw)
+            content_lines = capture.lines
             try:
-                yield FallbackCapture()
+                yield capture
             finally:
                 # Show compact output
+                skipped_lines = capture.skipped
                 cmd_name = title.lower()
                 if "docker" in cmd_name:
                     cmd_name = "docker command"
                 elif "command" in cmd_name:
                     cmd_name = "remote command"
 
-                now = datetime.now().strftime("%H:%M:%S")
+                now = _now_hms()
                 indicator = "[green]●[/green]"
-                self.console.print(f"{now}  {indicator}  [dim]{cmd_name}[/dim]")
+                out = [f"{now}  {indicator}  [dim]{cmd_name}[/dim]"]
 
                 if content_lines:
-                    filtered_lines = []
-                    prev_line = None
-                    for line in content_lines:
-                        if line != prev_line and line.strip():
-                            filtered_lines.append(line)
-                            prev_line = line
+                    filtered_lines = _dedup_nonempty(content_lines)
 
                     if filtered_lines:
                         max_output_lines = 5
@@ -625,73 +823,26 @@ class MLToolboxLogger:
                                 line = line[:77] + "..."
 
                             if idx == total_lines - 1:
-                                prefix = "      └─ "
+                                prefix = _TREE_LAST
                             else:
-                                prefix = "      │  "
+                                prefix = _TREE_PIPE
 
-                            self.console.print(f"{prefix}[dim]{line}[/dim]")
+                            out.append(_dim_line(prefix, line))
 
-                        if len(filtered_lines) > max_output_lines:
-                            remaining = len(filtered_lines) - max_output_lines
-                            self.console.print(
-                                f"      └─ [dim]... ({remaining} more lines)[/dim]"
+                        remaining = (
+                            max(len(filtered_lines) - max_output_lines, 0)
+                            + skipped_lines
+                        )
+                        if remaining:
+                            more_lines = (
+                                _MORE_LINES_APPROX if skipped_lines else _MORE_LINES
                             )
+                            out.append(more_lines.format(remaining))
+                self.console.print(*out, sep="\n")
 
     def _is_noise_line(self, line: str) -> bool:
         """Determine if a line is noise that should be filtered out."""
-        line_lower = line.lower().strip()
-
-        # Skip empty lines
-        if not line_lower:
-            return True
-
-        # Skip Docker build noise
-        docker_noise = [
-            "sending build context",
-            "step 1/",
-            "step 2/",
-            "step 3/",
-            "step 4/",
-            "step 5/",
-            "step 6/",
-            "step 7/",
-            "step 8/",
-            "step 9/",
-            "step 10/",
-            "---> using cache",
-            "---> running in",
-            "removing intermediate container",
-            "successfully built",
-            "successfully tagged",
-            "[+] building",
-            "=> load build definition",
-            "=> load .dockerignore",
-            "=> load metadata",
-            "=> transferring context",
-            "=> transferring dockerfile",
-            "=> cached",
-            "docker:default",
-            "=> =>",
-        ]
-
-        # Skip lines that are just Docker build progress
-        if any(noise in line_lower for noise in docker_noise):
-            return True
-
-        # Skip lines that are just timing or progress indicators
-        if re.match(r"^\s*\d+\.\d+s\s*$", line):
-            return True
-        if re.match(r"^\s*\[\d+/\d+\]\s*$", line):
-            return True
-        if re.match(r"^\s*#\d+\s*$", line):
-            return True
-
-        # Skip lines with ONLY special characters or whitespace (but allow lines with content + special chars)
-        if re.match(r"^[\s\[\]\(\)\-\+\=\>\<\|\.]*$", line) and len(line.strip()) < 5:
-            return True
-
-        # Most lines should be shown - only filter obvious noise
-        return False
+        return _is_noise_line(line)
 
     def table(self, data: list, headers: list, title: str | None = None):
         """Display data in a formatted table."""
@@ -703,7 +854,7 @@ class MLToolboxLogger:
             table.add_column(header)
 
         for row in data:
-            table.add_row(*[str(cell) for cell in row])
+            table.add_row(*[cell if type(cell) is str else str(cell) for cell in row])
 
         self.console.print(table)
 
@@ -1,17 +1,67 @@
+import codecs
+import fnmatch
+import functools
+import glob
+import hashlib
+import io
+import ipaddress
+import itertools
+import json
+import logging
 import os
 import re
+import shlex
+import shutil
+import socket
 import subprocess
 import sys
+import tarfile
+import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 import click
 
-from .helpers import RemoteConfig, remote_cmd
+from .helpers import RemoteConfig, get_ssh_config, remote_cmd, remote_cmd_batch
 from .logger import get_logger
 
+# Parsed ignore files as {path: (mtime_ns, size, patterns)}; edits invalidate via stat
+_IGNORE_PATTERN_CACHE: dict[str, tuple[int, int, frozenset[str]]] = {}
 
+
+def _cache_ignore_file(filename: str):
+    """Memoize an ignore-file parser on the file's path, mtime and size."""
+
+    def decorator(parse):
+        @functools.wraps(parse)
+        def wrapper(root_path: Path) -> set[str]:
+            ignore_path = root_path / filename
+            try:
+                st = ignore_path.stat()
+            except OSError:
+                return set()
+
+            key = str(ignore_path)
+            cached = _IGNORE_PATTERN_CACHE.get(key)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                return set(cached[2])
+
+            patterns = parse(root_path)
+            _IGNORE_PATTERN_CACHE[key] = (
+                st.st_mtime_ns,
+                st.st_size,
+                frozenset(patterns),
+            )
+            return patterns
+
+        return wrapper
+
+    return decorator
+
+
+@_cache_ignore_file(".gitignore")
 def parse_gitignore_patterns(root_path: Path) -> set[str]:
     """
     Parse .gitignore file from root directory and return exclusion patterns.
@@ -46,7 +96,7 @@ def parse_gitignore_patterns(root_path: Path) -> set[str]:
                     continue
 
                 # Convert gitignore pattern to rsync pattern
-                pattern = convert_gitignore_to_rsync(line, gitignore_path, root_path)
+                pattern = convert_gitignore_to_rsync(line)
                 if pattern:
                     patterns.add(pattern)
 
@@ -57,6 +107,7 @@ def parse_gitignore_patterns(root_path: Path) -> set[str]:
     return patterns
 
 
+@_cache_ignore_file(".dockerignore")
 def parse_dockerignore_patterns(root_path: Path) -> set[str]:
     """
     Parse .dockerignore file from root directory and return exclusion patterns.
@@ -85,7 +136,7 @@ def parse_dockerignore_patterns(root_path: Path) -> set[str]:
                     continue
 
                 # Convert dockerignore pattern to rsync pattern
-                pattern = convert_gitignore_to_rsync(line, dockerignore_path, root_path)
+                pattern = convert_gitignore_to_rsync(line)
                 if pattern:
                     patterns.add(pattern)
 
@@ -96,16 +147,58 @@ def parse_dockerignore_patterns(root_path: Path) -> set[str]:
     return patterns
 
 
-def convert_gitignore_to_rsync(
-    pattern: str, ignore_file_path: Path, root_path: Path
-) -> str:
+def get_git_ignored_paths(root_path: Path) -> list[str] | None:
+    """
+    Ask git for the untracked paths it ignores under root_path.
+
+    Unlike parse_gitignore_patterns this honours nested .gitignore files, negations
+    and .git/info/exclude, and wholly ignored directories are reported once.
+
+    Args:
+        root_path: Directory to list ignored paths for
+
+    Returns:
+        Ignored paths relative to root_path (directories end with "/"), escaped so
+        they match literally when used as exclusion patterns, or None if root_path
+        is not inside a git work tree or git is unavailable
+    """
+    try:
+        result = subprocess.run(
+            [
+                "git",
+                "-C",
+                str(root_path),
+                "ls-files",
+                "-z",
+                "--others",
+                "--ignored",
+                "--exclude-standard",
+                "--directory",
+            ],
+            capture_output=True,
+            check=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    # A name like "data[1].bin" would otherwise be read as a character class
+    return [
+        glob.escape(path)
+        for path in result.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+        if path
+    ]
+
+
+@functools.lru_cache(maxsize=4096)
+def convert_gitignore_to_rsync(pattern: str) -> str | None:
     """
     Convert a gitignore pattern to an rsync-compatible pattern.
 
+    The conversion is pure string work, so results are cached per pattern.
+
     Args:
         pattern: The gitignore pattern
-        ignore_file_path: Path to the ignore file containing this pattern
-        root_path: Root directory of the project
 
     Returns:
         Rsync-compatible pattern or None if conversion fails
@@ -140,6 +233,35 @@ def convert_gitignore_to_rsync(
         return pattern
 
 
+# Default exclusions for temporary/generated files
+_DEFAULT_EXCLUDES: tuple[str, ...] = (
+    "__pycache__",
+    "*.pyc",
+    "node_modules",
+    ".venv",
+    "*.egg-info",
+    ".DS_Store",
+    "wandb/",  # Weights & Biases logs
+    "outputs/",  # Common output directory
+    ".vscode-server/",  # VSCode server files
+    "*.swp",  # Vim swap files
+    ".idea/",  # PyCharm files
+    "dist/",  # Python distribution files
+    "build/",  # Build artifacts
+)
+
+
+def parse_exclude_option(exclude: str | None) -> list[str]:
+    """Split a comma-separated exclude option into unique, non-empty patterns.
+
+    Order is kept, so the first occurrence of a repeated pattern wins.
+    """
+    if not exclude:
+        return []
+    patterns = (pattern.strip() for pattern in exclude.split(","))
+    return list(dict.fromkeys(pattern for pattern in patterns if pattern))
+
+
 def get_all_exclusion_patterns(
     root_path: Path, user_excludes: list = None
 ) -> list[str]:
@@ -153,31 +275,17 @@ def get_all_exclusion_patterns(
     Returns:
         List of all exclusion patterns for rsync
     """
-    # Default exclusions for temporary/generated files
-    default_excludes = [
-        "__pycache__",
-        "*.pyc",
-        "node_modules",
-        ".venv",
-        "*.egg-info",
-        ".DS_Store",
-        "wandb/",  # Weights & Biases logs
-        "outputs/",  # Common output directory
-        ".vscode-server/",  # VSCode server files
-        "*.swp",  # Vim swap files
-        ".idea/",  # PyCharm files
-        "dist/",  # Python distribution files
-        "build/",  # Build artifacts
-    ]
-
-    # Parse ignore files
-    gitignore_patterns = parse_gitignore_patterns(root_path)
-    dockerignore_patterns = parse_dockerignore_patterns(root_path)
-
-    # Combine all patterns
-    all_patterns = set(default_excludes)
-    all_patterns.update(gitignore_patterns)
-    all_patterns.update(dockerignore_patterns)
+    all_patterns = set(_DEFAULT_EXCLUDES)
+
+    # Parse ignore files; let git list ignored paths when this is a repository.
+    # Those are root-relative, so they are anchored to keep them from matching
+    # the same name deeper in the tree
+    git_ignored = get_git_ignored_paths(root_path)
+    if git_ignored is None:
+        all_patterns.update(parse_gitignore_patterns(root_path))
+    else:
+        all_patterns.update(f"/{path}" for path in git_ignored)
+    all_patterns.update(parse_dockerignore_patterns(root_path))
 
     # Add user-provided patterns
     if user_excludes:
@@ -187,19 +295,151 @@ def get_all_exclusion_patterns(
     return sorted(list(all_patterns))
 
 
-def setup_zshrc(remote_config: RemoteConfig):
-    """Create a basic .zshrc file if it doesn't exist."""
-    remote_cmd(
-        remote_config,
-        [
-            "test -f ~/.zshrc || echo \"# Basic zsh configuration\nbindkey -e\nsetopt PROMPT_SUBST\nPS1='%n@%m:%~%# '\" > ~/.zshrc"
-        ],
-        use_working_dir=False,
+@functools.lru_cache(maxsize=None)
+def _ssh_base_opts(lan: bool = False) -> tuple[str, ...]:
+    """OpenSSH options shared by every non-interactive ssh and rsync call.
+
+    ControlMaster lets back-to-back invocations reuse one authenticated
+    connection instead of paying a fresh handshake each time, and ControlPersist
+    keeps it open long enough to serve repeated CLI runs too. ConnectTimeout
+    matches remote_cmd's paramiko timeout rather than the OS TCP SYN timeout,
+    and ServerAliveInterval notices a dropped link within seconds instead of
+    leaving a transfer hung on it.
+
+    Cipher and compression options only apply when a master connection is set
+    up, so LAN-tuned calls get a ControlPath of their own rather than riding on
+    a master opened with the defaults.
+    """
+    control_dir = Path.home() / ".ssh"
+    control_dir.mkdir(mode=0o700, exist_ok=True)
+    control_name = "cm-lan-%C" if lan else "cm-%C"
+    return (
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={control_dir}/{control_name}",
+        "-o",
+        "ControlPersist=600s",
+        "-o",
+        "StrictHostKeyChecking=accept-new",
+        "-o",
+        "ConnectTimeout=10",
+        "-o",
+        "ServerAliveInterval=5",
     )
 
 
-def setup_rclone(remote_config: RemoteConfig) -> None:
-    """Setup rclone configuration on remote host."""
+# AES-GCM is hardware accelerated on most CPUs; the rest of the list keeps the
+# connection working against servers that don't offer it
+_LAN_SSH_OPTS = (
+    "-o",
+    "Compression=no",
+    "-c",
+    "aes128-gcm@openssh.com,chacha20-poly1305@openssh.com,aes128-ctr",
+)
+
+
+def _rsync_ssh_command(remote_config: RemoteConfig, lan: bool = False) -> str:
+    """Build the remote shell command passed to rsync via -e."""
+    ssh_cmd = ["ssh", *_ssh_base_opts(lan)]
+    if lan:
+        ssh_cmd.extend(_LAN_SSH_OPTS)
+    if remote_config.port:
+        ssh_cmd.extend(["-p", str(remote_config.port)])
+    return shlex.join(ssh_cmd)
+
+
+def ssh_command(
+    remote_config: RemoteConfig, command: str, lan: bool = False
+) -> list[str]:
+    """Build an ssh invocation that runs a shell command on the remote host."""
+    ssh_cmd = ["ssh", *_ssh_base_opts(lan)]
+    if lan:
+        ssh_cmd.extend(_LAN_SSH_OPTS)
+    if remote_config.port:
+        ssh_cmd.extend(["-p", str(remote_config.port)])
+    ssh_cmd.extend([f"{remote_config.username}@{remote_config.host}", command])
+    return ssh_cmd
+
+
+_ZSHRC_TEMPLATE = """# Basic zsh configuration
+bindkey -e
+setopt PROMPT_SUBST
+PS1='%n@%m:%~%# '
+"""
+
+
+def setup_zshrc(remote_config: RemoteConfig, project_name: str | None = None):
+    """Create a basic .zshrc file if it doesn't exist.
+
+    Given a project name, the remote project directory is created in the same
+    round trip.
+    """
+    # printf with a single-quoted argument writes the template byte for byte,
+    # whatever the remote shell's echo does with quotes and escapes
+    commands = [
+        f"test -f ~/.zshrc || printf '%s' {shlex.quote(_ZSHRC_TEMPLATE)} > ~/.zshrc"
+    ]
+    if project_name:
+        commands.append(f"mkdir -p ~/projects/{project_name}")
+    remote_cmd_batch(remote_config, commands, use_working_dir=False)
+
+
+# Remote setup steps recorded as {step:user@host:port: [content digest, time]}
+_SETUP_RECORDS_FILE = Path("~/.config/mltoolbox/setup_records.json").expanduser()
+# Recorded steps are redone after this long even with unchanged inputs, in case
+# the host was rebuilt under the same address
+_SETUP_RECORD_TTL = 24 * 60 * 60
+# Setup steps may run on pool threads; serializes the record file's read-modify-write
+_SETUP_RECORDS_LOCK = threading.Lock()
+
+
+def _setup_record_key(remote_config: RemoteConfig, step: str) -> str:
+    port = remote_config.port or 22
+    return f"{step}:{remote_config.username}@{remote_config.host}:{port}"
+
+
+def _load_setup_records() -> dict:
+    try:
+        return json.loads(_SETUP_RECORDS_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _setup_is_current(key: str, digest: str) -> bool:
+    """Whether a setup step already ran with the same inputs within the TTL."""
+    record = _load_setup_records().get(key)
+    return (
+        isinstance(record, list)
+        and len(record) == 2
+        and record[0] == digest
+        and time.time() - record[1] < _SETUP_RECORD_TTL
+    )
+
+
+def _record_setup(key: str, digest: str) -> None:
+    with _SETUP_RECORDS_LOCK:
+        records = _load_setup_records()
+        records[key] = [digest, time.time()]
+        # Write a temp file and rename it over the records, like the .env write, so
+        # a reader never sees a partial file
+        tmp_file = _SETUP_RECORDS_FILE.with_name(
+            f"{_SETUP_RECORDS_FILE.name}.{os.getpid()}.tmp"
+        )
+        try:
+            _SETUP_RECORDS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(json.dumps(records, indent=2))
+            os.replace(tmp_file, _SETUP_RECORDS_FILE)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+
+
+def setup_rclone(remote_config: RemoteConfig, force: bool = False) -> None:
+    """Setup rclone configuration on remote host.
+
+    The upload is skipped when the same config was sent to the host within the
+    last day, unless force is set.
+    """
     logger = get_logger()
     local_rclone_config = Path.home() / ".config/rclone/rclone.conf"
 
@@ -207,31 +447,28 @@ def setup_rclone(remote_config: RemoteConfig) -> None:
         logger.warning("No local rclone config found at ~/.config/rclone/rclone.conf")
         return
 
-    logger.step("Setting up rclone configuration")
+    config_bytes = local_rclone_config.read_bytes()
+    digest = hashlib.sha256(config_bytes).hexdigest()
+    record_key = _setup_record_key(remote_config, "rclone")
+    if not force and _setup_is_current(record_key, digest):
+        logger.success("Rclone config already up to date on remote host")
+        return
 
-    # Create remote rclone config directory
-    remote_cmd(
-        remote_config,
-        ["mkdir -p ~/.config/rclone"],
-        use_working_dir=False,
-    )
+    logger.step("Setting up rclone configuration")
 
-    # Use scp to copy rclone config
+    # Create the remote config directory and stream the config over ssh stdin in
+    # one connection, rather than a remote mkdir followed by an scp
     try:
-        scp_cmd = [
-            "scp",
-            "-o",
-            "StrictHostKeyChecking=accept-new",
-        ]
-        if remote_config.port:
-            scp_cmd.extend(["-P", str(remote_config.port)])
-        scp_cmd.extend(
-            [
-                str(local_rclone_config),
-                f"{remote_config.username}@{remote_config.host}:~/.config/rclone/rclone.conf",
-            ]
+        subprocess.run(
+            ssh_command(
+                remote_config,
+                "mkdir -p ~/.config/rclone && umask 077 && "
+                "cat > ~/.config/rclone/rclone.conf",
+            ),
+            input=config_bytes,
+            check=True,
         )
-        subprocess.run(scp_cmd, check=True)
+        _record_setup(record_key, digest)
         logger.success("Rclone config synced successfully")
     except subprocess.CalledProcessError as e:
         logger.error(f"Failed to sync rclone config: {e}")
@@ -248,19 +485,10 @@ def setup_claude_code(remote_config: RemoteConfig) -> None:
 
     logger.step("Setting up Claude Code configuration")
 
-    # Create remote Claude Code config directory
-    remote_cmd(
-        remote_config,
-        ["mkdir -p ~/.claude"],
-        use_working_dir=False,
-    )
-
-    # Use rsync to sync entire .claude directory
+    # Use rsync to sync entire .claude directory; rsync creates ~/.claude itself,
+    # so no separate remote mkdir is needed
     try:
-        ssh_cmd = "ssh"
-        if remote_config.port:
-            ssh_cmd = f"ssh -p {remote_config.port}"
-
+        ssh_cmd = _rsync_ssh_command(remote_config)
         rsync_cmd = [
             "rsync",
             "-avz",  # archive, verbose, compress
@@ -277,6 +505,41 @@ def setup_claude_code(remote_config: RemoteConfig) -> None:
         logger.error(f"Failed to sync Claude Code directory: {e}")
 
 
+# Merges KEY=VALUE lines from $MLT_ENV_UPDATES into a .env file: existing keys are
+# replaced in place, new keys appended in order, comments and other lines kept
+_ENV_MERGE_AWK = r"""
+BEGIN {
+    n = split(ENVIRON["MLT_ENV_UPDATES"], lines, "\n")
+    for (i = 1; i <= n; i++) {
+        key = substr(lines[i], 1, index(lines[i], "=") - 1)
+        if (!(key in upd)) order[++m] = key
+        upd[key] = lines[i]
+    }
+}
+/^[ \t]*#/ { print; next }
+index($0, "=") {
+    key = substr($0, 1, index($0, "=") - 1)
+    gsub(/^[ \t]+|[ \t]+$/, "", key)
+    if (key in upd) { print upd[key]; seen[key] = 1; next }
+}
+{ print }
+END { for (i = 1; i <= m; i++) if (!(order[i] in seen)) print upd[order[i]] }
+"""
+
+
+# Any non-comment line with "=": the key is everything before the first "=",
+# the value everything after it, as the awk merge above splits them
+_ENV_LINE_RE = re.compile(r"^[ \t]*([^\s#=][^=\n]*?)?[ \t]*=([^\n]*)$", re.MULTILINE)
+
+
+def parse_env_content(content: str) -> dict:
+    """Parse .env file content into a dict of variables."""
+    return {
+        m.group(1) or "": m.group(2).strip().strip("'\"")
+        for m in _ENV_LINE_RE.finditer(content)
+    }
+
+
 def update_env_file(
     remote_config: RemoteConfig | None,
     project_name: str,
@@ -299,43 +562,55 @@ def update_env_file(
     try:
         # Get existing env vars (remote or local)
         if remote_config:
-            env_cmd = f"cd ~/projects/{project_name} && cat .env 2>/dev/null || echo ''"
-            result = remote_cmd(remote_config, [env_cmd])
+            # Merge on the remote side so only the updates cross the wire, and read
+            # the merged file back in the same round trip
+            update_lines = "\n".join(f"{key}={value}" for key, value in updates.items())
+            # The merge goes to a temp copy (same mode via cp -p) that is renamed
+            # over .env, so an interrupted write never leaves a truncated file
+            merge_cmd = (
+                f"cd ~/projects/{project_name} && touch .env && cp -p .env .env.tmp && "
+                f"MLT_ENV_UPDATES={shlex.quote(update_lines)} "
+                f"awk {shlex.quote(_ENV_MERGE_AWK)} .env > .env.tmp && "
+                "mv .env.tmp .env && cat .env"
+            )
+            result = remote_cmd(remote_config, [merge_cmd])
             env_content = result.stdout
         else:
             env_file = Path.cwd() / ".env"
             env_content = env_file.read_text() if env_file.exists() else ""
 
         # Parse existing env vars
-        env_dict = {}
-        for line in env_content.splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                env_dict[key.strip()] = value.strip().strip("'\"")
+        env_dict = parse_env_content(env_content)
 
         # Merge updates (updates take priority)
         env_dict.update(updates)
 
-        # Format env vars back into a file
-        env_lines = [f"{key}={value}" for key, value in env_dict.items()]
-        updated_env = "\n".join(env_lines)
-
-        # Write back
-        if remote_config:
-            write_cmd = f"cd ~/projects/{project_name} && cat > .env << 'EOF'\n{updated_env}\nEOF"
-            remote_cmd(remote_config, [write_cmd])
-        else:
-            env_file = Path.cwd() / ".env"
-            env_file.write_text(updated_env)
+        # Write back as one encoded buffer (the remote file was already merged in
+        # place), through a temp file renamed over .env like the remote merge
+        if not remote_config:
+            updated_env = "".join(f"{key}={value}\n" for key, value in env_dict.items())
+            # Replace the symlink target rather than the link, and keep the file's
+            # mode (it holds secrets, so a new file is private to the user)
+            target = env_file.resolve()
+            try:
+                mode = os.stat(target).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = 0o600
+            tmp_file = target.with_name(f"{target.name}.tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+            try:
+                # fchmod because the umask may have narrowed the mode os.open used
+                os.fchmod(fd, mode)
+                os.write(fd, updated_env.encode())
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, target)
 
-        logger = get_logger()
         logger.success(f"Updated .env file with {len(updates)} variables")
 
         return env_dict
 
     except Exception as e:
-        logger = get_logger()
         with logger.command_output(
             command="update .env file",
             status="failed",
@@ -354,23 +629,14 @@ def setup_remote_ssh_keys(remote_config: RemoteConfig, ssh_key_name: str = None)
     logger = get_logger()
     logger.step(f"Setting up SSH key '{ssh_key_name}' on remote host")
 
-    # Check if the key exists
-    key_check = remote_cmd(
-        remote_config,
-        [f"test -f ~/.ssh/{ssh_key_name} && echo 'exists' || echo 'missing'"],
-        use_working_dir=False,
-    ).stdout.strip()
-
-    if key_check == "missing":
-        with logger.command_output(
-            command="check SSH key",
-            status="failed",
-        ) as cmd_output:
-            cmd_output.write(f"SSH key '{ssh_key_name}' not found on remote host")
-        return False
-
-    # Setup agent and add key - ONLY ON THE HOST, NOT IN CONTAINER
+    # Setup agent and add key - ONLY ON THE HOST, NOT IN CONTAINER. The key check
+    # runs in the same session and reports a missing key with a sentinel
     ssh_agent_cmd = f"""
+    if [ ! -f ~/.ssh/{ssh_key_name} ]; then
+        echo "KEY_MISSING"
+        exit 0
+    fi
+
     # Start SSH agent if not running
     if [ -z "$SSH_AUTH_SOCK" ]; then
         eval $(ssh-agent -s)
@@ -395,6 +661,14 @@ def setup_remote_ssh_keys(remote_config: RemoteConfig, ssh_key_name: str = None)
             use_working_dir=False,
         )
 
+        if "KEY_MISSING" in result.stdout:
+            with logger.command_output(
+                command="check SSH key",
+                status="failed",
+            ) as cmd_output:
+                cmd_output.write(f"SSH key '{ssh_key_name}' not found on remote host")
+            return False
+
         if "The agent has no identities" in result.stdout:
             with logger.command_output(
                 command="setup SSH agent",
@@ -415,6 +689,15 @@ def setup_remote_ssh_keys(remote_config: RemoteConfig, ssh_key_name: str = None)
         return False
 
 
+def _port_open(host: str, port: int, timeout: float = 1.0) -> bool:
+    """Check whether a TCP connection to host:port can be established."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
 def wait_for_host(
     host: str,
     timeout: int | None = None,
@@ -440,36 +723,139 @@ def wait_for_host(
 
     remote_config = RemoteConfig(host=host, username=username, port=port)
 
+    # Resolve SSH aliases so the TCP probe targets the real address
+    try:
+        ssh_config = get_ssh_config(host)
+    except click.ClickException:
+        ssh_config = {}
+    probe_host = ssh_config.get("hostname", host)
+    try:
+        probe_port = int(port or ssh_config.get("port") or 22)
+    except ValueError:
+        probe_port = 22
+    # Hosts behind a jump host or proxy command can't be probed directly
+    can_probe = "proxyjump" not in ssh_config and "proxycommand" not in ssh_config
+
+    attempt = 0
     with logger.spinner(f"Waiting for host {host} to become available"):
         while not time_exceeded():
-            try:
-                # Try to run a simple command
-                remote_cmd(
-                    remote_config, ["echo 'testing connection'"], use_working_dir=False
-                )
-                logger.success("Host is available and accepting SSH connections!")
-                return True
-            except Exception as e:
-                logger.debug(f"Connection failed ({str(e)}), retrying...")
-                time.sleep(5)
+            # A TCP probe is far cheaper than a full SSH login while the host boots
+            if can_probe and not _port_open(probe_host, probe_port, timeout=2.0):
+                logger.debug(f"Port {probe_port} on {probe_host} not open, retrying...")
+            else:
+                try:
+                    # Confirm SSH auth with a no-op command
+                    remote_cmd(
+                        remote_config,
+                        ["true"],
+                        use_working_dir=False,
+                    )
+                    logger.success("Host is available and accepting SSH connections!")
+                    return True
+                except Exception as e:
+                    logger.debug(f"Connection failed ({str(e)}), retrying...")
+            # Poll quickly at first so a host that comes up is noticed promptly,
+            # and never sleep past the deadline
+            delay = min(0.5 * 2**attempt, 5)
+            if timeout:
+                delay = max(0.0, min(delay, start_time + timeout - time.time()))
+            time.sleep(delay)
+            attempt += 1
 
     logger.error(f"Timeout reached after {timeout} seconds")
     return False
 
 
-def should_exclude(path: Path, root: Path, exclude_patterns: list[str]) -> bool:
+@dataclass(frozen=True)
+class ExclusionMatcher:
+    """Exclusion patterns split into literal sets and combined regexes."""
+
+    # Wildcard-free, slash-free patterns, checked by set membership on the name
+    names: frozenset[str]
+    # Wildcard-free patterns containing "/" or anchored with a leading "/",
+    # checked against the relative path
+    paths: frozenset[str]
+    # Basename globs applied to the item's name, or None if there are none
+    name_regex: re.Pattern | None
+    # Path globs applied to the item's relative path, or None if there are none
+    path_regex: re.Pattern | None
+
+
+@functools.lru_cache(maxsize=32)
+def compile_exclusion_patterns(exclude_patterns: tuple[str, ...]) -> ExclusionMatcher:
+    """
+    Compile exclusion patterns into a matcher with the same semantics as
+    fnmatch-ing every pattern against both the item name and its relative path.
+    A leading "/" anchors a pattern to the root, as in rsync, so it is only
+    matched against the relative path.
+
+    Args:
+        exclude_patterns: Tuple of exclusion patterns
+
+    Returns:
+        ExclusionMatcher with literal buckets and combined name and path regexes
+    """
+    names = set()
+    paths = set()
+    name_parts = []
+    path_parts = []
+    for pattern in exclude_patterns:
+        # Remove trailing slash for directory patterns
+        clean_pattern = pattern.rstrip("/")
+        anchored = clean_pattern.startswith("/")
+        clean_pattern = clean_pattern.lstrip("/")
+        has_wildcard = any(c in clean_pattern for c in "*?[")
+
+        # Names never contain "/", so only slash-free patterns can match them
+        if "/" not in clean_pattern and not anchored:
+            if has_wildcard:
+                regex = fnmatch.translate(clean_pattern)
+                name_parts.append(regex)
+                # fnmatch wildcards ("*", "?" and "[...]") all match "/", so the
+                # pattern can match a path its name does not
+                path_parts.append(regex)
+            else:
+                # Bare names like node_modules only ever match literally
+                names.add(clean_pattern)
+        elif has_wildcard:
+            path_parts.append(fnmatch.translate(clean_pattern))
+        else:
+            paths.add(clean_pattern)
+
+        # Directory patterns also exclude everything below the directory
+        if pattern.endswith("/"):
+            if has_wildcard:
+                path_parts.append(fnmatch.translate(f"{clean_pattern}/*"))
+            else:
+                path_parts.append(re.escape(clean_pattern) + r"(?:/|\Z)")
+
+    return ExclusionMatcher(
+        names=frozenset(names),
+        paths=frozenset(paths),
+        name_regex=re.compile("|".join(name_parts)) if name_parts else None,
+        path_regex=re.compile("|".join(path_parts)) if path_parts else None,
+    )
+
+
+def should_exclude(
+    path: Path, root: Path, exclude_patterns: list[str] | ExclusionMatcher
+) -> bool:
     """
     Check if a path should be excluded based on exclusion patterns.
 
     Args:
         path: Path to check
         root: Root directory for relative path calculation
-        exclude_patterns: List of exclusion patterns
+        exclude_patterns: List of exclusion patterns, or a matcher compiled from
+            them with compile_exclusion_patterns
 
     Returns:
         True if path should be excluded, False otherwise
     """
-    import fnmatch
+    if isinstance(exclude_patterns, ExclusionMatcher):
+        matcher = exclude_patterns
+    else:
+        matcher = compile_exclusion_patterns(tuple(exclude_patterns))
 
     # Get relative path from root
     try:
@@ -477,32 +863,29 @@ def should_exclude(path: Path, root: Path, exclude_patterns: list[str]) -> bool:
     except ValueError:
         return False
 
-    rel_path_str = str(rel_path)
+    # Patterns use "/" separators, so match against the posix form of the path
+    return _matches_exclusion(matcher, path.name, rel_path.as_posix())
 
-    # Check against each exclusion pattern
-    for pattern in exclude_patterns:
-        # Remove trailing slash for directory patterns
-        clean_pattern = pattern.rstrip("/")
-
-        # Check direct match
-        if fnmatch.fnmatch(rel_path_str, clean_pattern):
-            return True
 
-        # Check if any parent directory matches
-        if fnmatch.fnmatch(path.name, clean_pattern):
-            return True
+def _matches_exclusion(matcher: ExclusionMatcher, name: str, rel_path_str: str) -> bool:
+    """Check a name and its root-relative path against a compiled matcher."""
+    if name in matcher.names:
+        return True
+    if matcher.name_regex is not None and matcher.name_regex.match(name):
+        return True
 
-        # Check directory patterns (pattern ending with /)
-        if pattern.endswith("/"):
-            if (
-                rel_path_str.startswith(clean_pattern + "/")
-                or rel_path_str == clean_pattern
-            ):
-                return True
+    if rel_path_str in matcher.paths:
+        return True
+    if matcher.path_regex is not None and matcher.path_regex.match(rel_path_str):
+        return True
 
     return False
 
 
+# Directory entry counts in the sync preview stop at this many items
+_PREVIEW_COUNT_LIMIT = 1000
+
+
 def generate_sync_preview(root_path: Path, exclude_patterns: list[str]) -> dict:
     """
     Generate a first-level tree preview of what will be synced.
@@ -512,15 +895,23 @@ def generate_sync_preview(root_path: Path, exclude_patterns: list[str]) -> dict:
         exclude_patterns: List of exclusion patterns
 
     Returns:
-        Dictionary with files and directories that will be synced
+        Dictionary with files and directories that will be synced, plus the
+        names of excluded top-level directories (never walked)
     """
-    preview = {"files": [], "directories": []}
+    preview = {"files": [], "directories": [], "excluded_dirs": []}
+    # Compile the patterns once instead of per item
+    matcher = compile_exclusion_patterns(tuple(exclude_patterns))
 
     try:
-        # Get first-level items only
-        for item in sorted(root_path.iterdir()):
+        # Get first-level items only; scandir entries carry their file type from the
+        # directory read, so is_file/is_dir don't need a stat per item
+        with os.scandir(root_path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+
+        for entry in entries:
+            name = entry.name
             # Skip hidden files/directories except specific ones
-            if item.name.startswith(".") and item.name not in [
+            if name.startswith(".") and name not in [
                 ".env",
                 ".gitignore",
                 ".dockerignore",
@@ -528,25 +919,32 @@ def generate_sync_preview(root_path: Path, exclude_patterns: list[str]) -> dict:
             ]:
                 continue
 
-            # Check if excluded
-            if should_exclude(item, root_path, exclude_patterns):
+            # Check if excluded; excluded directories are recorded but never walked.
+            # First-level items have their name as the relative path.
+            if _matches_exclusion(matcher, name, name):
+                if entry.is_dir():
+                    preview["excluded_dirs"].append(name)
                 continue
 
-            if item.is_file():
+            if entry.is_file():
                 # Get file size
                 try:
-                    size = item.stat().st_size
+                    size = entry.stat().st_size
                     size_str = format_size(size)
-                    preview["files"].append((item.name, size_str))
+                    preview["files"].append((name, size_str))
                 except (OSError, PermissionError):
-                    preview["files"].append((item.name, "?"))
-            elif item.is_dir():
-                # Count items in directory (non-recursively)
+                    preview["files"].append((name, "?"))
+            elif entry.is_dir():
+                # Count items in directory (non-recursively), stopping early on huge ones
                 try:
-                    count = sum(1 for _ in item.iterdir())
-                    preview["directories"].append((item.name, count))
+                    with os.scandir(entry.path) as sub_it:
+                        sub_entries = itertools.islice(sub_it, _PREVIEW_COUNT_LIMIT + 1)
+                        count = sum(1 for _ in sub_entries)
+                    if count > _PREVIEW_COUNT_LIMIT:
+                        count = f">{_PREVIEW_COUNT_LIMIT} items"
+                    preview["directories"].append((name, count))
                 except (OSError, PermissionError):
-                    preview["directories"].append((item.name, "?"))
+                    preview["directories"].append((name, "?"))
 
     except (OSError, PermissionError):
         pass
@@ -554,17 +952,26 @@ def generate_sync_preview(root_path: Path, exclude_patterns: list[str]) -> dict:
     return preview
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_size(size_bytes: int) -> str:
     """Format size in bytes to human-readable format."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f}{unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f}TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f}B"
+    # Each unit is 2**10 larger, so the bit length picks the unit directly
+    unit_index = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.1f}{_SIZE_UNITS[unit_index]}"
+
 
+def print_sync_preview(
+    logger, root_path: Path, exclude_patterns: list[str], summary_only: bool = False
+) -> dict:
+    """Print a preview of what will be synced and return the preview data.
 
-def print_sync_preview(logger, root_path: Path, exclude_patterns: list[str]):
-    """Print a preview of what will be synced."""
+    With ``summary_only`` the per-item tree is left out and only the totals and
+    exclusion lines are printed.
+    """
     preview = generate_sync_preview(root_path, exclude_patterns)
 
     # Use compact tree-style format
@@ -578,13 +985,13 @@ def print_sync_preview(logger, root_path: Path, exclude_patterns: list[str]):
     content_lines = []
 
     # Print directories
-    if preview["directories"]:
+    if preview["directories"] and not summary_only:
         for dir_name, count in preview["directories"]:
             count_str = f"{count} items" if isinstance(count, int) else count
             content_lines.append(f"📁 {dir_name}/ ({count_str})")
 
     # Print files
-    if preview["files"]:
+    if preview["files"] and not summary_only:
         for file_name, size in preview["files"]:
             content_lines.append(f"📄 {file_name} ({size})")
 
@@ -592,7 +999,13 @@ def print_sync_preview(logger, root_path: Path, exclude_patterns: list[str]):
     total_dirs = len(preview["directories"])
     total_files = len(preview["files"])
     content_lines.append(f"📊 Total: {total_dirs} directories, {total_files} files")
-    content_lines.append(f"🚫 Excluding {len(exclude_patterns)} patterns")
+    excluded_line = f"🚫 Excluding {len(exclude_patterns)} patterns"
+    if preview["excluded_dirs"]:
+        skipped_dirs = ", ".join(f"{name}/" for name in preview["excluded_dirs"][:5])
+        if len(preview["excluded_dirs"]) > 5:
+            skipped_dirs += ", ..."
+        excluded_line += f" (skipping {skipped_dirs})"
+    content_lines.append(excluded_line)
 
     # Print with tree indentation
     if content_lines:
@@ -611,6 +1024,8 @@ def print_sync_preview(logger, root_path: Path, exclude_patterns: list[str]):
             remaining = len(content_lines) - max_output_lines
             logger.console.print(f"      └─ [dim]... ({remaining} more items)[/dim]")
 
+    return preview
+
 
 def verify_env_vars(remote: RemoteConfig | None = None, dryrun: bool = False) -> dict:  # noqa: FA100
     """Verify required environment variables and return all env vars as dict."""
@@ -628,11 +1043,7 @@ def verify_env_vars(remote: RemoteConfig | None = None, dryrun: bool = False) ->
     if remote:
         # First get all env vars
         result = remote_cmd(remote, ["test -f .env && cat .env || echo ''"])
-        for line in result.stdout.splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                env_vars[key] = value.strip("'\"")
+        env_vars = parse_env_content(result.stdout)
         missing_vars = [var for var in required_vars if var not in env_vars]
         if missing_vars:
             raise click.ClickException(
@@ -640,14 +1051,10 @@ def verify_env_vars(remote: RemoteConfig | None = None, dryrun: bool = False) ->
             )
     else:
         # Local environment check
-        if not Path.cwd().joinpath(".env").exists():
+        env_file = Path.cwd() / ".env"
+        if not env_file.exists():
             raise click.ClickException(".env file not found")
-        with open(Path.cwd().joinpath(".env")) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    env_vars[key] = value.strip("'\"")
+        env_vars = parse_env_content(env_file.read_text())
         for var in required_vars:
             if var not in env_vars and os.getenv(var):
                 env_vars[var] = os.getenv(var)
@@ -659,6 +1066,272 @@ def verify_env_vars(remote: RemoteConfig | None = None, dryrun: bool = False) ->
     return env_vars
 
 
+_RSYNC_VERSION_RE = re.compile(r"rsync\s+version\s+v?(\d+)\.(\d+)")
+_REMOTE_RSYNC_VERSIONS: dict[tuple, tuple[int, int] | None] = {}
+
+
+def _parse_rsync_version(output: str) -> tuple[int, int] | None:
+    match = _RSYNC_VERSION_RE.search(output)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+@functools.lru_cache(maxsize=1)
+def _local_rsync_version() -> tuple[int, int] | None:
+    try:
+        result = subprocess.run(
+            ["rsync", "--version"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return _parse_rsync_version(result.stdout)
+
+
+def _remote_rsync_version(remote_config: RemoteConfig) -> tuple[int, int] | None:
+    """Return the remote rsync (major, minor) version, probed once per host."""
+    key = (remote_config.username, remote_config.host, remote_config.port)
+    if key not in _REMOTE_RSYNC_VERSIONS:
+        try:
+            output = remote_cmd(
+                remote_config, ["rsync --version | head -1"], use_working_dir=False
+            ).stdout
+        except Exception:
+            output = ""
+        _REMOTE_RSYNC_VERSIONS[key] = _parse_rsync_version(output)
+    return _REMOTE_RSYNC_VERSIONS[key]
+
+
+@functools.lru_cache(maxsize=32)
+def _is_lan_host(host: str) -> bool:
+    """Whether an SSH host (or alias) resolves to a private/LAN address.
+
+    Loopback addresses (e.g. a port-forwarded tunnel) are not a LAN link, and
+    neither is a private address reached through a jump host or proxy command.
+    """
+    try:
+        ssh_config = get_ssh_config(host)
+    except click.ClickException:
+        ssh_config = {}
+    if "proxyjump" in ssh_config or "proxycommand" in ssh_config:
+        return False
+    hostname = ssh_config.get("hostname", host)
+    try:
+        address = ipaddress.ip_address(socket.gethostbyname(hostname))
+    except (OSError, ValueError):
+        return False
+    return address.is_private and not address.is_loopback
+
+
+def _rsync_supports_zstd(remote_config: RemoteConfig) -> bool:
+    """Whether rsync >= 3.2 (zstd support) runs on both ends."""
+    local_version = _local_rsync_version()
+    if not local_version or local_version < (3, 2):
+        return False
+    remote_version = _remote_rsync_version(remote_config)
+    return bool(remote_version and remote_version >= (3, 2))
+
+
+def _rsync_transfer_args(
+    remote_config: RemoteConfig, compress: str | None, lan: bool
+) -> list:
+    """Pick rsync transfer flags for the link type and compression choice.
+
+    compress is "off", "zstd", or None to auto-detect: no compression on LAN
+    links, otherwise zstd when both ends support it and fast zlib if not. LAN
+    links also skip rsync's delta algorithm, which costs more CPU than it saves.
+    """
+    if compress not in (None, "zstd", "off"):
+        raise ValueError(f"Unsupported compress option: {compress!r}")
+    args = ["--whole-file", "--inplace"] if lan else []
+    if compress == "off" or (compress is None and lan):
+        return args
+    if compress is None and not _rsync_supports_zstd(remote_config):
+        return [*args, "-z", "--compress-level=1"]
+    return [*args, "--compress-choice=zstd", "--compress-level=3"]
+
+
+# Printed by the remote status check when the project directory is empty
+_EMPTY_REMOTE_MARKER = "__mltoolbox_empty__"
+
+
+# Filter arguments shared by every rsync run over the project tree. The top-level
+# .env is included ahead of the exclusion patterns, read from stdin, since the
+# first matching rule wins
+_RSYNC_FILTER_ARGS = ("--include=/.env", "--exclude-from=-")
+
+# One --list-only line: permissions, size, date, time, then the name as is
+_RSYNC_LIST_RE = re.compile(rb"(\S+)\s+\S+ \S+ \S+ (.*)")
+# rsync escapes unprintable bytes in names as \#ooo
+_RSYNC_ESCAPE_RE = re.compile(rb"\\#([0-7]{3})")
+
+
+def _list_sync_entries(
+    root_path: Path, exclude_patterns: list[str]
+) -> list[str] | None:
+    """List the root-relative paths rsync would send, directories included.
+
+    rsync applies the filter rules itself, so a streamed first sync sends the
+    same files later rsync runs do; parents come before their contents. Returns
+    None if the listing failed, was empty, or had a line in an unknown format,
+    so the caller falls back to rsync rather than streaming an incomplete tree.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "rsync",
+                "-a",
+                "-8",  # Leave non-ASCII names unescaped
+                "--list-only",
+                *_RSYNC_FILTER_ARGS,
+                f"{root_path}/",
+            ],
+            input="".join(f"{pattern}\n" for pattern in exclude_patterns).encode(
+                "utf-8", errors="surrogateescape"
+            ),
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    entries = []
+    for line in result.stdout.split(b"\n"):
+        if not line:
+            continue
+        match = _RSYNC_LIST_RE.fullmatch(line)
+        if not match:
+            return None
+        mode, name = match.groups()
+        if mode.startswith(b"l"):
+            # Symlinks are listed as "name -> target"
+            name = name.split(b" -> ", 1)[0]
+        if name == b".":
+            continue
+        name = _RSYNC_ESCAPE_RE.sub(lambda m: bytes([int(m[1], 8)]), name)
+        entries.append(name.decode("utf-8", errors="surrogateescape"))
+    return entries or None
+
+
+# Modes every synced directory and file gets on the remote
+_RSYNC_DIR_MODE = "u=rwx,go=rx"
+_RSYNC_FILE_MODE = "u=rw,go=r"
+
+
+def _stream_initial_sync(
+    remote_config: RemoteConfig,
+    project_root: Path,
+    remote_path: str,
+    exclude_patterns: list[str],
+    compress: str | None,
+    lan: bool,
+) -> bool:
+    """Copy project_root into an empty remote directory as one tar stream.
+
+    With nothing on the remote to compare against, rsync's file-list exchange
+    is pure overhead; tar starts sending bytes immediately. Returns False if
+    any stage of the pipe failed, in which case rsync finishes the job.
+    """
+    entries = _list_sync_entries(project_root, exclude_patterns)
+    if entries is None:
+        return False
+    # "./" keeps tar from reading names that start with "-" as options
+    file_list = "".join(f"./{entry}\0" for entry in entries)
+    compressor = None
+    if compress != "off" and not (compress is None and lan):
+        compressor = shutil.which("pigz") or shutil.which("gzip")
+    # Give the extracted tree the owner and modes rsync's --no-owner and --chmod
+    # would, so later syncs don't change them
+    target = f"~/projects/{remote_path}"
+    extract_cmd = (
+        f"tar --no-same-owner --no-same-permissions -xf - -C {target} && "
+        f"find {target} -type d -exec chmod {_RSYNC_DIR_MODE} {{}} + && "
+        f"find {target} -type f -exec chmod {_RSYNC_FILE_MODE} {{}} +"
+    )
+    if compressor:
+        # pigz writes plain gzip, so the remote needs nothing beyond gzip
+        extract_cmd = f"gzip -dc | {extract_cmd}"
+
+    # COPYFILE_DISABLE stops macOS tar from adding AppleDouble ._ entries
+    tar_process = subprocess.Popen(
+        [
+            "tar",
+            "-C",
+            str(project_root),
+            "-cf",
+            "-",
+            "--no-recursion",
+            "--null",
+            "-T",
+            "-",
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        env={**os.environ, "COPYFILE_DISABLE": "1"},
+    )
+    stages = [tar_process]
+    if compressor:
+        stages.append(
+            subprocess.Popen(
+                [compressor, "-1"], stdin=tar_process.stdout, stdout=subprocess.PIPE
+            )
+        )
+        tar_process.stdout.close()
+    stages.append(
+        subprocess.Popen(
+            ssh_command(remote_config, extract_cmd, lan=lan), stdin=stages[-1].stdout
+        )
+    )
+    stages[-2].stdout.close()
+
+    try:
+        tar_process.stdin.write(file_list.encode("utf-8", errors="surrogateescape"))
+        tar_process.stdin.close()
+    except BrokenPipeError:
+        # tar exited early; its exit code is checked below
+        pass
+    return all([process.wait() == 0 for process in stages])
+
+
+# Upper bound on concurrent rsync processes for one project sync. Workers share
+# the ControlMaster connection, one session each, so this stays well below
+# sshd's default MaxSessions of 10
+_RSYNC_MAX_WORKERS = 4
+
+
+def _rsync_shard_filters(
+    root_path: Path, exclude_patterns: list[str], workers: int
+) -> list[list[str]]:
+    """Split a sync across rsync workers by top-level entry.
+
+    Returns one list of filter arguments per worker. Each excludes the top-level
+    entries owned by the other workers; every worker also reads the same
+    resolved --exclude-from=- list, so the rules below its own entries match.
+    """
+    matcher = compile_exclusion_patterns(tuple(exclude_patterns))
+    try:
+        names = sorted(
+            name
+            for name in os.listdir(root_path)
+            if name == ".env" or not _matches_exclusion(matcher, name, name)
+        )
+    except OSError:
+        return [[]]
+    workers = min(workers, len(names))
+    if workers < 2:
+        return [[]]
+
+    def anchored(name: str) -> str:
+        # Backslashes only escape in patterns that contain wildcards
+        if any(c in name for c in "*?["):
+            name = re.sub(r"([*?\[\\])", r"\\\1", name)
+        return f"--exclude=/{name}"
+
+    shards = [names[i::workers] for i in range(workers)]
+    return [
+        [anchored(name) for other in shards if other is not shard for name in other]
+        for shard in shards
+    ]
+
+
 def sync_project(
     remote_config: RemoteConfig,
     project_name: str,
@@ -667,6 +1340,8 @@ def sync_project(
     source_path: Path | None = None,
     dryrun: bool = False,
     force: bool = False,
+    compress: str | None = None,
+    lan: bool | None = None,
 ) -> None:
     """Sync project files with remote host (one-way, local to remote)
 
@@ -677,6 +1352,10 @@ def sync_project(
         exclude: Patterns to exclude
         force: Skip confirmation prompts
         source_path: Optional source path to sync from (defaults to current directory)
+        compress: "zstd", "off", or None to skip compression on LAN links and
+            otherwise use zstd when both rsync ends support it, zlib if not
+        lan: Tune the transfer for a fast local link; None detects it from
+            whether the host resolves to a private address
     """
     logger = get_logger()
     if dryrun:
@@ -685,101 +1364,117 @@ def sync_project(
         ) as output:
             for i in range(10):
                 output.write(f"Simulated sync file {i + 1}\n")
-                import time as _time
-
-                _time.sleep(0.1)
+                time.sleep(0.1)
         logger.success("[DRY RUN] Project sync simulated.")
         return
 
     remote_path = remote_path or project_name
     project_root = source_path if source_path else Path.cwd()
 
-    # Check if project directory exists and is a git repo
-    check_git = remote_cmd(
-        remote_config,
-        [
-            f"test -d ~/projects/{remote_path}/.git && echo 'exists' || echo 'not_exists'"
-        ],
-    ).stdout.strip()
-
-    # Only check git status if the repo exists
-    do_project_sync = True
-    if check_git == "exists":
-        remote_status = remote_cmd(
-            remote_config,
-            [f"cd ~/projects/{remote_path} && git status --porcelain"],
-        ).stdout.strip()
-
-        if (
-            remote_status
-            and not force
-            and not click.confirm(
-                "WARNING: Remote has untracked/modified files:\n"
-                f"{remote_status}\n"
-                "Do you want to proceed with sync? This might overwrite changes!",
-                default=False,
-            )
-        ):
-            logger.info("Skipping project sync, continuing with SSH key sync...")
-            do_project_sync = False
+    # Every ssh call below uses the same transport, so they share one master
+    # connection with the LAN tuning applied from the start
+    if lan is None:
+        lan = _is_lan_host(remote_config.host)
 
     # First sync SSH keys if they exist
     local_ssh_dir = Path.home() / ".ssh"
     ssh_key_name = os.getenv("SSH_KEY_NAME", "id_ed25519")
 
-    if (local_ssh_dir / ssh_key_name).exists():
-        # Create .ssh directory with correct permissions
-        remote_cmd(
-            remote_config,
-            ["mkdir -p ~/.ssh", "chmod 700 ~/.ssh"],
-            use_working_dir=False,
-        )
+    # The key and .env copies run as background processes so their round trips
+    # overlap the remote commands and each other
+    transfers = []  # (success message, failure label, process)
 
-        # Transfer SSH keys using scp - NO PERMISSION CHANGES
-        for key_file in [ssh_key_name, f"{ssh_key_name}.pub"]:
-            try:
-                # Use scp for direct file copy
-                scp_cmd = [
-                    "scp",
-                    "-o",
-                    "StrictHostKeyChecking=accept-new",
-                ]
-                if remote_config.port:
-                    scp_cmd.extend(["-P", str(remote_config.port)])
-                scp_cmd.extend(
-                    [
-                        str(local_ssh_dir / key_file),
-                        f"{remote_config.username}@{remote_config.host}:~/.ssh/{key_file}",
-                    ]
+    if (local_ssh_dir / ssh_key_name).exists():
+        # Send the key pair as one tar stream over a single ssh connection that also
+        # creates ~/.ssh, instead of a remote mkdir plus one scp per key file
+        key_files = [
+            key_file
+            for key_file in [ssh_key_name, f"{ssh_key_name}.pub"]
+            if (local_ssh_dir / key_file).exists()
+        ]
+        try:
+            archive = io.BytesIO()
+            with tarfile.open(fileobj=archive, mode="w", dereference=True) as tar:
+                for key_file in key_files:
+                    tar.add(local_ssh_dir / key_file, arcname=key_file)
+
+            ssh_copy_cmd = ssh_command(
+                remote_config,
+                "mkdir -p ~/.ssh && chmod 700 ~/.ssh && "
+                "tar --no-same-owner -C ~/.ssh -xf -",
+                lan=lan,
+            )
+            process = subprocess.Popen(ssh_copy_cmd, stdin=subprocess.PIPE)
+            process.stdin.write(archive.getvalue())
+            process.stdin.close()
+            transfers.append(
+                (
+                    f"Copied SSH keys {', '.join(key_files)} to remote host",
+                    "SSH keys",
+                    process,
                 )
-                subprocess.run(scp_cmd, check=True)
-                logger.success(f"Copied SSH key {key_file} to remote host")
-            except Exception as e:
-                logger.warning(f"Failed to sync {key_file}: {e}")
-
-    # Fix for the .env problem: manually copy .env file first if it exists
-    local_env_file = Path.cwd() / ".env"
-    if local_env_file.exists():
+            )
+        except Exception as e:
+            logger.warning(f"Failed to sync SSH keys: {e}")
+
+    # If the project directory is already a git repo, check its status; otherwise
+    # report whether it is missing or empty, all in one round trip. Nothing is
+    # created on the remote until the sync is confirmed
+    remote_status = remote_cmd_batch(
+        remote_config,
+        [
+            f"if test -d ~/projects/{remote_path}/.git; then "
+            f"cd ~/projects/{remote_path} && git status --porcelain; "
+            f"elif [ ! -d ~/projects/{remote_path} ] || "
+            f'[ -z "$(ls -A ~/projects/{remote_path})" ]; then '
+            f"echo {_EMPTY_REMOTE_MARKER}; fi",
+        ],
+        use_working_dir=False,
+    ).stdout.strip()
+    remote_empty = remote_status == _EMPTY_REMOTE_MARKER
+    if remote_empty:
+        remote_status = ""
+
+    do_project_sync = True
+    if (
+        remote_status
+        and not force
+        and not click.confirm(
+            "WARNING: Remote has untracked/modified files:\n"
+            f"{remote_status}\n"
+            "Do you want to proceed with sync? This might overwrite changes!",
+            default=False,
+        )
+    ):
+        logger.info("Skipping project sync, continuing with SSH key sync...")
+        do_project_sync = False
+
+    # .env is normally gitignored; rsync force-includes it below, so it only needs
+    # a separate copy when the project sync itself is skipped
+    local_env_file = project_root / ".env"
+    if not do_project_sync and local_env_file.exists():
         logger.step("Syncing .env file separately to ensure it's transferred")
         try:
-            scp_cmd = [
-                "scp",
-                "-o",
-                "StrictHostKeyChecking=accept-new",
-            ]
-            if remote_config.port:
-                scp_cmd.extend(["-P", str(remote_config.port)])
-            scp_cmd.extend(
-                [
-                    str(local_env_file),
-                    f"{remote_config.username}@{remote_config.host}:~/projects/{remote_path or project_name}/.env",
-                ]
+            # A file this small is cheaper to pipe through ssh stdin than to scp
+            process = subprocess.Popen(
+                ssh_command(
+                    remote_config, f"cat > ~/projects/{remote_path}/.env", lan=lan
+                ),
+                stdin=subprocess.PIPE,
             )
-            subprocess.run(scp_cmd, check=True)
-            logger.success(".env file synced successfully")
+            process.stdin.write(local_env_file.read_bytes())
+            process.stdin.close()
+            transfers.append((".env file synced successfully", ".env file", process))
         except Exception as e:
             logger.warning(f"Failed to sync .env file: {e}")
 
+    for success_message, label, process in transfers:
+        returncode = process.wait()
+        if returncode == 0:
+            logger.success(success_message)
+        else:
+            logger.warning(f"Failed to sync {label}: exit code {returncode}")
+
     if not do_project_sync:
         return
 
@@ -790,33 +1485,71 @@ def sync_project(
         use_working_dir=False,
     )
 
-    # Get all exclusion patterns from gitignore, dockerignore, and user-provided patterns
-    user_excludes = exclude.split(",") if exclude else []
+    user_excludes = parse_exclude_option(exclude)
+
+    # Get all exclusion patterns from gitignore, dockerignore, and user-provided
+    # patterns. rsync gets this same resolved list, so what it sends matches the
+    # preview; its own dir-merge filters can't read gitignore negations or "**"
     all_excludes = get_all_exclusion_patterns(project_root, user_excludes)
 
-    # Show sync preview
-    print_sync_preview(logger, project_root, all_excludes)
+    # Show sync preview unless output is suppressed; MLTOOLBOX_NO_PREVIEW cuts it
+    # down to the totals and exclusion lines
+    preview = None
+    if logger.is_enabled_for(logging.INFO):
+        preview = print_sync_preview(
+            logger,
+            project_root,
+            all_excludes,
+            summary_only=bool(os.environ.get("MLTOOLBOX_NO_PREVIEW")),
+        )
 
     # Build rsync command
-    ssh_cmd = "ssh"
-    if remote_config.port:
-        ssh_cmd = f"ssh -p {remote_config.port}"
+    ssh_cmd = _rsync_ssh_command(remote_config, lan=lan)
     rsync_cmd = [
         "rsync",
-        "-avz",  # archive, verbose, compress
-        "--progress",  # Show progress during transfer (compatible with older rsync)
-        "--stats",  # Show detailed transfer statistics
+        "-av",  # archive, verbose
+        *_rsync_transfer_args(remote_config, compress, lan),
         "--no-owner",  # Don't sync owner
         "--no-group",  # Don't sync group
         "--ignore-errors",  # Delete even if there are I/O errors
-        "--chmod=Du=rwx,go=rx,Fu=rw,go=r",  # Set sane permissions
+        f"--chmod=D{_RSYNC_DIR_MODE},F{_RSYNC_FILE_MODE}",  # Set sane permissions
         "-e",
         ssh_cmd,
     ]
-
-    # Add exclude patterns
-    for pattern in all_excludes:
-        rsync_cmd.extend(["--exclude", pattern.strip()])
+    interactive = sys.stdout.isatty()
+    # rsync sends progress and stats to stdout, errors to stderr. Without progress
+    # output or debug logging nothing reads stdout, so rsync writes it straight to
+    # /dev/null instead of through a Python reader, and isn't asked for stats
+    parse_stdout = interactive or logger.is_enabled_for(logging.DEBUG)
+    # rsync >= 3.1 can report one running total for the whole transfer instead of
+    # a progress line per file, which is far less output to parse on large trees
+    overall_progress = (_local_rsync_version() or (0, 0)) >= (3, 1)
+    if interactive and overall_progress:
+        rsync_cmd.append("--info=progress2,stats2,name0")
+    elif interactive:
+        rsync_cmd.extend(
+            [
+                "--progress",  # Show progress during transfer (compatible with older rsync)
+                "--stats",  # Show detailed transfer statistics
+            ]
+        )
+    elif parse_stdout and overall_progress:
+        # Nobody watches per-file progress in scripted runs; only report final stats
+        rsync_cmd.append("--info=stats2,flist0")
+    elif parse_stdout:
+        # --info needs rsync >= 3.1; older builds still get the final stats
+        rsync_cmd.append("--stats")
+
+    # Trees are split across parallel rsync workers by top-level entry. The
+    # per-file --progress parser below follows a single stream of filename and
+    # progress lines, so that mode keeps to one worker
+    workers = min(os.cpu_count() or 1, _RSYNC_MAX_WORKERS)
+    if interactive and not overall_progress:
+        workers = 1
+    shard_filters = _rsync_shard_filters(project_root, all_excludes, workers)
+    # Exclusion patterns are read from stdin rather than passed as one --exclude
+    # flag per pattern
+    rsync_cmd.extend(_RSYNC_FILTER_ARGS)
 
     # Add source and destination
     rsync_cmd.extend(
@@ -825,6 +1558,28 @@ def sync_project(
             f"{remote_config.username}@{remote_config.host}:~/projects/{remote_path}/",
         ]
     )
+    filters_at = rsync_cmd.index(_RSYNC_FILTER_ARGS[0])
+    # Every worker multiplexes over the same master connection, so extra workers
+    # cost a session rather than a TCP and auth handshake each
+    rsync_cmds = [
+        [*rsync_cmd[:filters_at], *filters, *rsync_cmd[filters_at:]]
+        for filters in shard_filters
+    ]
+
+    def report_success():
+        logger.success("Sync completed successfully!")
+        # Show summary of what was synced, reusing the preview's walk of the tree
+        total_dirs = len(preview["directories"]) if preview else 0
+        total_files = len(preview["files"]) if preview else 0
+        if total_dirs > 0 or total_files > 0:
+            logger.summary(
+                "Sync Summary",
+                [
+                    f"{total_dirs} directories synced",
+                    f"{total_files} files synced",
+                    f"Excluded {len(all_excludes)} patterns",
+                ],
+            )
 
     try:
         # Display sync info in compact tree format
@@ -837,15 +1592,36 @@ def sync_project(
             f"      └─ [dim]To:[/dim] {remote_config.host}:~/projects/{remote_path}"
         )
 
+        # The first sync into an empty directory streams a tar archive; if that
+        # fails, rsync below fills in whatever is missing
+        if remote_empty:
+            if _stream_initial_sync(
+                remote_config, project_root, remote_path, all_excludes, compress, lan
+            ):
+                report_success()
+                return
+            logger.warning("Streaming initial sync failed, falling back to rsync")
+
         # Run rsync with progress bar
-        # Note: rsync sends progress to stdout, errors to stderr
-        process = subprocess.Popen(
-            rsync_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-            bufsize=1,
-        )
+        exclude_list = "".join(f"{pattern}\n" for pattern in all_excludes)
+        processes = []
+        for worker_cmd in rsync_cmds:
+            process = subprocess.Popen(
+                worker_cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE if parse_stdout else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+                bufsize=1,
+            )
+            # rsync reads the whole exclude list at startup, before writing any output
+            try:
+                process.stdin.write(exclude_list)
+                process.stdin.close()
+            except BrokenPipeError:
+                # rsync exited early; its exit code and stderr are reported below
+                pass
+            processes.append(process)
 
         # Parse rsync progress output and display minimal progress updates
         # Regex patterns for rsync --progress output
@@ -874,19 +1650,35 @@ def sync_project(
 
         total_bytes = None
         bytes_transferred = 0
+        # Running totals reported by each worker, summed for display
+        worker_bytes = [0] * len(processes)
+        worker_totals = [0] * len(processes)
         completed_files = {}  # Track completed files to avoid double counting
         current_file = "Scanning files..."
         current_file_size = 0
         last_update_time = time.time()
-        stderr_output = []  # Capture stderr for error reporting
+        # Capture stderr per worker for error reporting
+        stderr_output = [[] for _ in processes]
         expecting_filename = False  # Track if we're expecting a filename line
         file_count = 0
 
         # Read stdout for progress (rsync sends progress to stdout!)
         # stderr is only for errors
-        import threading
-
-        def read_stdout():
+        def iter_pipe_lines(pipe):
+            # Read the pipe in large chunks and split lines here instead of paying
+            # a readline call per line; rsync redraws progress lines with \r
+            fd = pipe.fileno()
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            pending = ""
+            while chunk := os.read(fd, 65536):
+                pending += decoder.decode(chunk).replace("\r", "\n")
+                *lines, pending = pending.split("\n")
+                yield from lines
+            pending += decoder.decode(b"", final=True)
+            if pending:
+                yield pending
+
+        def read_stdout(worker):
             nonlocal \
                 bytes_transferred, \
                 total_bytes, \
@@ -896,7 +1688,7 @@ def sync_project(
                 last_update_time, \
                 expecting_filename, \
                 file_count
-            for line in process.stdout:
+            for line in iter_pipe_lines(processes[worker].stdout):
                 if not line:
                     continue
                 line_stripped = line.strip()
@@ -943,31 +1735,40 @@ def sync_project(
                     current_file_size = size_bytes
                     percent_int = int(percent)
 
-                    # Get current file being processed
-                    full_filename = current_file  # Use the last filename we saw
-                    if full_filename not in completed_files:
-                        completed_files[full_filename] = 0
-
-                    # Calculate bytes for this file based on percentage
-                    file_bytes_transferred = int((percent_int / 100) * size_bytes)
-
-                    # When file reaches 100%, mark it as completed
-                    if percent_int == 100:
-                        # File completed - add remaining bytes
-                        if completed_files[full_filename] < size_bytes:
-                            bytes_transferred += (
-                                size_bytes - completed_files[full_filename]
-                            )
-                            completed_files[full_filename] = size_bytes
-                            file_count += 1
+                    if overall_progress:
+                        # progress2 lines carry running totals for the whole
+                        # transfer, so the total size follows from the percentage
+                        worker_bytes[worker] = size_bytes
+                        bytes_transferred = sum(worker_bytes)
+                        if percent_int:
+                            worker_totals[worker] = size_bytes * 100 // percent_int
+                            total_bytes = sum(worker_totals)
                     else:
-                        # File in progress - update bytes
-                        if completed_files[full_filename] < file_bytes_transferred:
-                            bytes_transferred += (
-                                file_bytes_transferred
-                                - completed_files[full_filename]
-                            )
-                            completed_files[full_filename] = file_bytes_transferred
+                        # Get current file being processed
+                        full_filename = current_file  # Use the last filename we saw
+                        if full_filename not in completed_files:
+                            completed_files[full_filename] = 0
+
+                        # Calculate bytes for this file based on percentage
+                        file_bytes_transferred = int((percent_int / 100) * size_bytes)
+
+                        # When file reaches 100%, mark it as completed
+                        if percent_int == 100:
+                            # File completed - add remaining bytes
+                            if completed_files[full_filename] < size_bytes:
+                                bytes_transferred += (
+                                    size_bytes - completed_files[full_filename]
+                                )
+                                completed_files[full_filename] = size_bytes
+                                file_count += 1
+                        else:
+                            # File in progress - update bytes
+                            if completed_files[full_filename] < file_bytes_transferred:
+                                bytes_transferred += (
+                                    file_bytes_transferred
+                                    - completed_files[full_filename]
+                                )
+                                completed_files[full_filename] = file_bytes_transferred
 
                     # Print minimal progress update every 1 second
                     current_time = time.time()
@@ -987,58 +1788,59 @@ def sync_project(
                 # Parse "total size is X" from stats (also in stdout)
                 match = total_bytes_pattern.search(line_stripped)
                 if match:
-                    total_bytes = int(match.group(1).replace(",", ""))
+                    worker_totals[worker] = int(match.group(1).replace(",", ""))
+                    total_bytes = sum(worker_totals)
                     continue
 
                 # Log other stdout lines as debug
                 logger.debug(line_stripped)
 
-        def read_stderr():
-            # Capture stderr for error reporting only
-            nonlocal stderr_output
-            for line in process.stderr:
-                stderr_output.append(line)
+        def read_stderr(worker):
+            # Capture stderr for error reporting only; draining it as it arrives
+            # keeps rsync from blocking on a full pipe
+            for line in iter_pipe_lines(processes[worker].stderr):
+                stderr_output[worker].append(line + "\n")
                 if line.strip():
                     logger.debug(f"rsync stderr: {line.strip()}")
 
         # Start threads to read both streams
         # stdout has progress, stderr has errors
-        stdout_thread = threading.Thread(target=read_stdout, daemon=True)
-        stderr_thread = threading.Thread(target=read_stderr, daemon=True)
-        stdout_thread.start()
-        stderr_thread.start()
+        readers = []
+        for worker in range(len(processes)):
+            readers.append(
+                threading.Thread(target=read_stderr, args=(worker,), daemon=True)
+            )
+            if parse_stdout:
+                readers.append(
+                    threading.Thread(target=read_stdout, args=(worker,), daemon=True)
+                )
+        for reader in readers:
+            reader.start()
 
-        # Wait for process to complete
-        process.wait()
+        # Wait for every worker to complete
+        for process in processes:
+            process.wait()
 
         # Wait for threads to finish reading
-        stdout_thread.join(timeout=2)
-        stderr_thread.join(timeout=2)
-
-        if process.returncode == 0:
-            logger.success("Sync completed successfully!")
-            # Show summary of what was synced
-            preview = generate_sync_preview(project_root, all_excludes)
-            total_dirs = len(preview["directories"])
-            total_files = len(preview["files"])
-            if total_dirs > 0 or total_files > 0:
-                logger.summary(
-                    "Sync Summary",
-                    [
-                        f"{total_dirs} directories synced",
-                        f"{total_files} files synced",
-                        f"Excluded {len(all_excludes)} patterns",
-                    ],
-                )
+        for reader in readers:
+            reader.join(timeout=2)
+
+        failed = [process for process in processes if process.returncode != 0]
+        if not failed:
+            report_success()
         else:
-            # Use captured stderr output from the thread
-            stderr_text = "".join(stderr_output) if stderr_output else ""
+            # Report the captured stderr of the failed workers only, each whole
+            stderr_text = "".join(
+                line
+                for worker, process in enumerate(processes)
+                if process.returncode != 0
+                for line in stderr_output[worker]
+            )
             raise subprocess.CalledProcessError(
-                process.returncode, rsync_cmd, stderr=stderr_text
+                failed[0].returncode, failed[0].args, stderr=stderr_text
             )
 
     except subprocess.CalledProcessError as e:
-        logger = get_logger()
         error_details = []
         if e.stderr:
             error_details.append(e.stderr)
@@ -1078,9 +1880,7 @@ def fetch_remote(
     local_dir.parent.mkdir(parents=True, exist_ok=True)
 
     # Build rsync command
-    ssh_cmd = "ssh"
-    if remote_config.port:
-        ssh_cmd = f"ssh -p {remote_config.port}"
+    ssh_cmd = _rsync_ssh_command(remote_config)
     rsync_cmd = [
         "rsync",
         "-avz",
@@ -1089,10 +1889,12 @@ def fetch_remote(
         ssh_cmd,
     ]
 
-    # Add exclude patterns if specified
+    # Pass exclude patterns on stdin rather than one --exclude flag per pattern
+    exclude_list = None
     if exclude:
-        for pattern in exclude:
-            rsync_cmd.extend(["--exclude", pattern])
+        rsync_cmd.append("--exclude-from=-")
+        patterns = dict.fromkeys(pattern.strip() for pattern in exclude)
+        exclude_list = "".join(f"{pattern}\n" for pattern in patterns if pattern)
 
     # Add source and destination
     rsync_cmd.extend(
@@ -1104,7 +1906,7 @@ def fetch_remote(
 
     logger = get_logger()
     logger.step(f"Downloading {remote_path} to {local_path}")
-    subprocess.run(rsync_cmd, check=True)
+    subprocess.run(rsync_cmd, input=exclude_list, text=True, check=True)
     logger.success("Download complete!")
 
 
@@ -1143,10 +1945,10 @@ def build_rclone_cmd(
     if dry_run:
         rclone_args.append("--dry-run")
 
-    # Add exclude patterns
-    for pattern in exclude.split(","):
-        if pattern.strip():
-            rclone_args.append(f"--exclude={pattern.strip()}")
+    # Add exclude patterns, skipping repeats rclone would otherwise match twice
+    rclone_args.extend(
+        f"--exclude={pattern}" for pattern in parse_exclude_option(exclude)
+    )
 
     return rclone_args
 
@@ -1178,31 +1980,30 @@ def run_rclone_sync(
 
     # Execute rclone command
     logger = get_logger()
-    if logger.logger.level <= 10:  # DEBUG level
+    if logger.is_enabled_for(logging.DEBUG):
         logger.debug(f"Running: {' '.join(rclone_args)}")
 
     try:
         # Create log files
-        log_path = Path.home() / "rclone.log"
-        history_path = Path.home() / "sync_history.log"
+        home = Path.home()
+        log_path = home / "rclone.log"
+        history_path = home / "sync_history.log"
 
-        # Execute the command and capture output
+        # Pipe output through tee to both the console and the log file, so it
+        # flows between the processes without passing through Python at all
+        sys.stdout.flush()
         process = subprocess.Popen(
             rclone_args,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1,
         )
-
-        # Stream output to both console and log file
-        with open(log_path, "w") as log_file:
-            for line in iter(process.stdout.readline, ""):
-                sys.stdout.write(line)
-                log_file.write(line)
+        tee_process = subprocess.Popen(["tee", str(log_path)], stdin=process.stdout)
+        process.stdout.close()
 
         # Wait for process to complete
         exit_code = process.wait()
+        if tee_process.wait() != 0:
+            logger.warning(f"Failed to write rclone log to {log_path}")
 
         # Log result
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
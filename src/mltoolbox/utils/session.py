@@ -1,3 +1,4 @@
+import atexit
 import os
 import subprocess
 import threading
@@ -22,6 +23,7 @@ class SSHSessionManager:
             cls._instance._cleanup_thread = None
             cls._instance._cleanup_interval = 300
             cls._instance._session_timeout = 1800
+            cls._instance._keepalive_interval = 60
             cls._instance._agent_initialized = False
             cls._instance._agent_lock = threading.Lock()
         return cls._instance
@@ -192,11 +194,9 @@ class SSHSessionManager:
     ) -> paramiko.SSHClient:
         session_key = self._get_session_key(hostname, username)
 
-        # Create lock if it doesn't exist
-        if session_key not in self._locks:
-            self._locks[session_key] = threading.Lock()
-
-        with self._locks[session_key]:
+        # Create lock if it doesn't exist; setdefault is atomic, so concurrent
+        # callers for the same host always share one lock and one session
+        with self._locks.setdefault(session_key, threading.Lock()):
             # Check if session exists and is active
             if session_key in self._sessions:
                 transport = self._sessions[session_key].get_transport()
@@ -218,6 +218,9 @@ class SSHSessionManager:
 
             try:
                 ssh.connect(hostname=hostname, username=username, **connect_kwargs)
+                # Sessions sit idle between commands; keepalives stop NAT and
+                # firewall state from expiring underneath them
+                ssh.get_transport().set_keepalive(self._keepalive_interval)
                 self._sessions[session_key] = ssh
                 self._last_used[session_key] = time.time()
                 self._start_cleanup_thread()
@@ -289,3 +292,6 @@ class SSHSessionManager:
 
 
 session_manager = SSHSessionManager()
+# Close the shared connections on exit instead of leaving them to the transports'
+# daemon threads
+atexit.register(session_manager.close_all)
@@ -22,12 +22,15 @@ class SubprocessRunner:
         cwd: str | None = None,
         env: dict | None = None,
         shell: bool = False,
+        docker: bool = False,
+        raw: bool = False,
     ) -> subprocess.CompletedProcess:
         """
         Run command with live output in a bordered panel.
         """
         if self.dryrun:
-            with self.logger.live_output(f"{title} [DRY RUN]") as output:
+            # Simulated output is plain text, so skip terminal cleanup
+            with self.logger.live_output(f"{title} [DRY RUN]", raw=True) as output:
                 for i in range(10):
                     output.write(f"Simulated output line {i + 1}\n")
                     _time.sleep(0.1)
@@ -36,7 +39,7 @@ class SubprocessRunner:
         if isinstance(cmd, str) and not shell:
             cmd = cmd.split()
         start_time = _time.time()
-        with self.logger.live_output(title) as output:
+        with self.logger.live_output(title, docker=docker, raw=raw) as output:
             try:
                 process = subprocess.Popen(
                     cmd,
@@ -73,13 +76,15 @@ class SubprocessRunner:
         env: dict | None = None,
         shell: bool = False,
         capture_output: bool = True,
+        docker: bool = False,
+        raw: bool = False,
     ) -> subprocess.CompletedProcess:
         """
         Run command and display output in a panel after completion.
         """
         if self.dryrun:
             with self.logger.panel_output(
-                f"{title}", subtitle="[DRY RUN]", status="success"
+                f"{title}", subtitle="[DRY RUN]", status="success", raw=True
             ) as panel:
                 panel.write(
                     f"Would run: {cmd}\nSimulated output...\nAll actions skipped."
@@ -116,6 +121,8 @@ class SubprocessRunner:
                 status=status,
                 exit_code=result.returncode,
                 duration=duration,
+                docker=docker,
+                raw=raw,
             ) as panel:
                 panel.write(output_content)
             if result.returncode == 0: